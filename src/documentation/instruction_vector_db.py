@@ -6,9 +6,11 @@ Creates and manages a vector database for semantic search of Studio 5000 instruc
 documentation including syntax, parameters, examples, and usage patterns.
 """
 
+import heapq
 import json
 import os
 import pickle
+import sys
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
@@ -18,6 +20,15 @@ import logging
 import faiss
 import time
 
+try:
+    from vector_common import (DEFAULT_MODEL_NAME, QUANTIZATION_TYPES, VectorCache, build_index,
+                               embed_incrementally, get_model, search_params)
+except ImportError:
+    # Imported without src/ on sys.path (e.g. run directly); add it as the MCP server does
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from vector_common import (DEFAULT_MODEL_NAME, QUANTIZATION_TYPES, VectorCache, build_index,
+                               embed_incrementally, get_model, search_params)
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,29 +48,42 @@ class InstructionSearchResult:
 class InstructionVectorDatabase:
     """Vector database for Studio 5000 instruction documentation"""
     
-    def __init__(self, cache_dir: str = "instruction_vector_cache"):
+    def __init__(self, cache_dir: str = "instruction_vector_cache", quantization: str = "fp32"):
+        """
+        Args:
+            cache_dir: Directory for the cached index, embeddings and instruction documentation data
+            quantization: Index storage below the HNSW threshold - 'fp32' (exact,
+                default) or 'int8' (scalar quantized; the full-precision embeddings
+                are kept on disk for incremental rebuilds only)
+        """
+        if quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Unknown quantization '{quantization}', expected one of {sorted(QUANTIZATION_TYPES)}")
+        
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.quantization = quantization
         
         # Initialize sentence transformer for embeddings
+        self.model_name = DEFAULT_MODEL_NAME
         self.model = None
         self.index = None
         self.instructions_data = []
+        self._positions_by_name: Dict[str, int] = {}  # Uppercased name -> instructions_data position
+        self._positions_by_category: Dict[str, List[int]] = {}  # Lowercased category -> positions by name
+        self._categories: List[str] = []
         self.embeddings = None
+        self._embedding_keys: List[str] = []  # Content hash of each embeddings row
         
-        # Cache file paths
-        self.index_cache = self.cache_dir / "instruction_index.faiss"
-        self.embeddings_cache = self.cache_dir / "instruction_embeddings.pkl"
-        self.data_cache = self.cache_dir / "instruction_data.pkl"
+        # Cache files, switched between generations by a manifest
+        self.vector_cache = VectorCache(self.cache_dir, "instruction")
     
     def initialize_model(self):
         """Initialize the sentence transformer model"""
         if self.model is None:
             logger.info("Loading sentence transformer model...")
             try:
-                # Use the same model as SDK for consistency
-                from sentence_transformers import SentenceTransformer
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
+                # Shared with the SDK database, so the weights are loaded once
+                self.model = get_model(self.model_name)
                 logger.info("Model loaded successfully")
             except Exception as e:
                 logger.error(f"Failed to load sentence transformer: {e}")
@@ -71,8 +95,9 @@ class InstructionVectorDatabase:
         # Check if cached version exists and is recent
         if not force_rebuild and self._cache_exists() and self._cache_is_recent():
             logger.info("Loading cached instruction vector database...")
-            self._load_from_cache()
-            return
+            if self._load_from_cache():
+                return
+            logger.warning("Cached instruction vector database is incomplete, rebuilding")
         
         # Convert instructions dict to list format
         instruction_list = []
@@ -92,6 +117,7 @@ class InstructionVectorDatabase:
         logger.info(f"Building vector database for {len(instruction_list)} instructions...")
         
         self.instructions_data = instruction_list
+        self._build_lookup_indexes()
         self.initialize_model()
         
         if self.model is None:
@@ -107,24 +133,36 @@ class InstructionVectorDatabase:
             texts_to_embed.append(text)
         
         logger.info("Creating embeddings...")
-        start_time = time.time()
-        self.embeddings = self.model.encode(texts_to_embed, show_progress_bar=True)
-        embedding_time = time.time() - start_time
+        start_time = time.perf_counter()
+        self.embeddings, self._embedding_keys = self._embed_incrementally(texts_to_embed)
+        embedding_time = time.perf_counter() - start_time
         logger.info(f"Created {len(self.embeddings)} embeddings in {embedding_time:.2f} seconds")
         
         # Build FAISS index for fast similarity search
         logger.info("Building FAISS index...")
-        dimension = self.embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(dimension)  # Inner product for cosine similarity
-        
-        # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(self.embeddings)
-        self.index.add(self.embeddings.astype(np.float32))
+        self.index = build_index(self.embeddings, self.quantization)
         
         # Save to cache
         self._save_to_cache()
+        
+        # int8 codes live in the index; the embeddings are only needed on disk
+        if self.quantization == 'int8':
+            self.embeddings = None
+            self._embedding_keys = []
         logger.info("Instruction vector database built and cached successfully")
     
+    def _embed_incrementally(self, texts: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Embed texts, reusing previous rows for texts whose content hash is unchanged"""
+        previous_embeddings, previous_keys = self._previous_embeddings()
+        return embed_incrementally(self.model, texts, previous_embeddings, previous_keys)
+    
+    def _previous_embeddings(self) -> Tuple[Optional[np.ndarray], List[str]]:
+        """Embeddings and content keys from the last build, in memory or on disk"""
+        
+        if self.embeddings is not None and len(self._embedding_keys) == len(self.embeddings):
+            return self.embeddings, self._embedding_keys
+        return self.vector_cache.previous_embeddings(self.model_name)
+    
     def _create_embedding_text(self, instruction: Dict[str, Any]) -> str:
         """Create comprehensive text for embedding an instruction"""
         text_parts = [
@@ -156,40 +194,55 @@ class InstructionVectorDatabase:
     
     def search_instructions(self, query: str, limit: int = 20, min_score: float = 0.1) -> List[InstructionSearchResult]:
         """Search for instructions using vector similarity"""
+        return self.search_instructions_batch([query], limit, min_score)[0]
+    
+    def search_instructions_batch(self, queries: List[str], limit: int = 20,
+                                  min_score: float = 0.1) -> List[List[InstructionSearchResult]]:
+        """Search for several queries with one model forward pass and one index search"""
+        if not queries:
+            return []
+        
         if not self.model or not self.index:
             logger.warning("Vector search not available, falling back to text search")
-            return self._text_search(query, limit)
+            return [self._text_search(query, limit) for query in queries]
         
         try:
-            # Create embedding for the query
-            query_embedding = self.model.encode([query])
-            faiss.normalize_L2(query_embedding)
+            # Create embeddings for all queries at once
+            query_embeddings = self.model.encode(list(queries))
+            faiss.normalize_L2(query_embeddings)
             
             # Search the index
-            scores, indices = self.index.search(query_embedding.astype(np.float32), limit)
-            
-            results = []
-            for score, idx in zip(scores[0], indices[0]):
-                if score >= min_score and idx < len(self.instructions_data):
-                    instruction = self.instructions_data[idx]
-                    
-                    result = InstructionSearchResult(
-                        name=instruction['name'],
-                        category=instruction['category'],
-                        description=instruction['description'],
-                        languages=instruction['languages'],
-                        score=float(score),
-                        syntax=instruction.get('syntax'),
-                        parameters=instruction.get('parameters'),
-                        examples=instruction.get('examples')
-                    )
-                    results.append(result)
+            scores, indices = self.index.search(query_embeddings.astype(np.float32), limit,
+                                                params=search_params(self.index, limit))
             
-            return results
+            return [self._collect_results(row_scores, row_indices, min_score)
+                    for row_scores, row_indices in zip(scores, indices)]
             
         except Exception as e:
             logger.error(f"Vector search failed: {e}")
-            return self._text_search(query, limit)
+            return [self._text_search(query, limit) for query in queries]
+    
+    def _collect_results(self, scores: np.ndarray, indices: np.ndarray,
+                         min_score: float) -> List[InstructionSearchResult]:
+        """Convert one query's index hits into search results"""
+        results = []
+        for score, idx in zip(scores, indices):
+            if score >= min_score and 0 <= idx < len(self.instructions_data):
+                instruction = self.instructions_data[idx]
+                
+                result = InstructionSearchResult(
+                    name=instruction['name'],
+                    category=instruction['category'],
+                    description=instruction['description'],
+                    languages=instruction['languages'],
+                    score=float(score),
+                    syntax=instruction.get('syntax'),
+                    parameters=instruction.get('parameters'),
+                    examples=instruction.get('examples')
+                )
+                results.append(result)
+        
+        return results
     
     def _text_search(self, query: str, limit: int) -> List[InstructionSearchResult]:
         """Fallback text-based search"""
@@ -231,58 +284,66 @@ class InstructionVectorDatabase:
                 )
                 results.append(result)
         
-        # Sort by match score and limit results
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:limit]
+        # Select the top results by match score
+        return heapq.nlargest(limit, results, key=lambda x: x.score)
+    
+    def _build_lookup_indexes(self):
+        """Index instructions_data for exact lookups"""
+        self._positions_by_name = {}
+        positions_by_category = {}
+        for position, instruction in enumerate(self.instructions_data):
+            # First occurrence wins, as with the linear scan this replaces
+            self._positions_by_name.setdefault(instruction['name'].upper(), position)
+            category = instruction.get('category', '')
+            positions_by_category.setdefault(category.lower(), []).append(position)
+        
+        # Listings are returned sorted by name; the sort is stable, as before
+        for positions in positions_by_category.values():
+            positions.sort(key=lambda position: self.instructions_data[position]['name'])
+        self._positions_by_category = positions_by_category
+        self._categories = sorted({instruction['category'] for instruction in self.instructions_data
+                                   if instruction.get('category')})
     
     def get_instruction_by_name(self, name: str) -> Optional[InstructionSearchResult]:
         """Get specific instruction by exact name match"""
-        name_upper = name.upper()
+        position = self._positions_by_name.get(name.upper())
+        if position is None:
+            return None
         
-        for instruction in self.instructions_data:
-            if instruction['name'].upper() == name_upper:
-                return InstructionSearchResult(
-                    name=instruction['name'],
-                    category=instruction['category'],
-                    description=instruction['description'],
-                    languages=instruction['languages'],
-                    score=1.0,
-                    syntax=instruction.get('syntax'),
-                    parameters=instruction.get('parameters'),
-                    examples=instruction.get('examples')
-                )
-        
-        return None
+        instruction = self.instructions_data[position]
+        return InstructionSearchResult(
+            name=instruction['name'],
+            category=instruction['category'],
+            description=instruction['description'],
+            languages=instruction['languages'],
+            score=1.0,
+            syntax=instruction.get('syntax'),
+            parameters=instruction.get('parameters'),
+            examples=instruction.get('examples')
+        )
     
     def get_instructions_by_category(self, category: str) -> List[InstructionSearchResult]:
         """Get all instructions in a specific category"""
         results = []
-        category_lower = category.lower()
+        for position in self._positions_by_category.get(category.lower(), []):
+            instruction = self.instructions_data[position]
+            result = InstructionSearchResult(
+                name=instruction['name'],
+                category=instruction['category'],
+                description=instruction['description'],
+                languages=instruction['languages'],
+                score=1.0,
+                syntax=instruction.get('syntax'),
+                parameters=instruction.get('parameters'),
+                examples=instruction.get('examples')
+            )
+            results.append(result)
         
-        for instruction in self.instructions_data:
-            if instruction.get('category', '').lower() == category_lower:
-                result = InstructionSearchResult(
-                    name=instruction['name'],
-                    category=instruction['category'],
-                    description=instruction['description'],
-                    languages=instruction['languages'],
-                    score=1.0,
-                    syntax=instruction.get('syntax'),
-                    parameters=instruction.get('parameters'),
-                    examples=instruction.get('examples')
-                )
-                results.append(result)
-        
-        return sorted(results, key=lambda x: x.name)
+        return results
     
     def get_categories(self) -> List[str]:
         """Get all unique instruction categories"""
-        categories = set()
-        for instruction in self.instructions_data:
-            if instruction.get('category'):
-                categories.add(instruction['category'])
-        
-        return sorted(list(categories))
+        return list(self._categories)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics"""
@@ -308,67 +369,48 @@ class InstructionVectorDatabase:
             'by_category': by_category,
             'by_language': by_language,
             'cache_dir': str(self.cache_dir),
-            'model_name': 'all-MiniLM-L6-v2' if self.model else None
+            'quantization': self.quantization,
+            'model_name': self.model_name if self.model else None
         }
     
     def _cache_exists(self) -> bool:
-        """Check if cache files exist"""
-        return (self.index_cache.exists() and 
-                self.embeddings_cache.exists() and 
-                self.data_cache.exists())
+        """Check if a cached build with an index exists"""
+        manifest = self.vector_cache.read_manifest()
+        return bool(manifest and manifest.get('index') and manifest.get('embeddings'))
     
     def _cache_is_recent(self, max_age_days: int = 7) -> bool:
         """Check if cache is recent enough"""
-        try:
-            cache_age = time.time() - self.data_cache.stat().st_mtime
-            return cache_age < (max_age_days * 24 * 3600)
-        except:
-            return False
+        cache_age = self.vector_cache.age_seconds()
+        return cache_age is not None and cache_age < (max_age_days * 24 * 3600)
     
     def _save_to_cache(self):
         """Save vector database to cache files"""
         try:
-            # Save instruction data
-            with open(self.data_cache, 'wb') as f:
-                pickle.dump(self.instructions_data, f)
-            
-            if self.embeddings is not None:
-                # Save embeddings
-                with open(self.embeddings_cache, 'wb') as f:
-                    pickle.dump(self.embeddings, f)
-            
-            if self.index is not None:
-                # Save FAISS index
-                faiss.write_index(self.index, str(self.index_cache))
-            
+            self.vector_cache.save(self.instructions_data, self.index, self.embeddings,
+                                   self._embedding_keys, self.model_name, self.quantization)
             logger.info(f"Cached instruction vector database to {self.cache_dir}")
             
         except Exception as e:
             logger.error(f"Failed to save cache: {e}")
     
-    def _load_from_cache(self):
-        """Load vector database from cache files"""
-        try:
-            # Load instruction data
-            with open(self.data_cache, 'rb') as f:
-                self.instructions_data = pickle.load(f)
-            
-            self.initialize_model()
-            
-            # Load embeddings if available
-            if self.embeddings_cache.exists():
-                with open(self.embeddings_cache, 'rb') as f:
-                    self.embeddings = pickle.load(f)
-            
-            # Load FAISS index if available
-            if self.index_cache.exists():
-                self.index = faiss.read_index(str(self.index_cache))
-            
-            logger.info(f"Loaded instruction vector database from cache ({len(self.instructions_data)} instructions)")
-            
-        except Exception as e:
-            logger.error(f"Failed to load cache: {e}")
-            raise
+    def _load_from_cache(self) -> bool:
+        """Load vector database from cache files; False if the cache must be rebuilt"""
+        # Embeddings are memory-mapped and only read by rebuilds; int8 builds do not need them
+        cached = self.vector_cache.load(load_embeddings=self.quantization != 'int8')
+        if cached is None or cached.quantization != self.quantization:
+            return False
+        
+        self.instructions_data = cached.records
+        self._build_lookup_indexes()
+        
+        self.initialize_model()
+        
+        self.embeddings = cached.embeddings
+        self._embedding_keys = cached.embedding_keys
+        self.index = cached.index
+        
+        logger.info(f"Loaded instruction vector database from cache ({len(self.instructions_data)} instructions)")
+        return True
 
 
 def main():
@@ -157,7 +157,7 @@ class PDFParser:
             return self._parse_pdf_optimized(file_path, max_pages, sample_complex_pages)
         
         logger.info(f"🔍 Parsing PDF: {file_path}")
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         chunks = []
         stats = PDFParsingStats(
@@ -208,7 +208,7 @@ class PDFParser:
             stats.errors.append(error_msg)
             raise
         
-        stats.processing_time = time.time() - start_time
+        stats.processing_time = time.perf_counter() - start_time
         stats.total_chunks = len(chunks)
         
         logger.info(f"✅ PDF parsing completed:")
@@ -233,17 +233,17 @@ class PDFParser:
         drawings_data = []
         
         logger.info(f"  🔍 Starting drawing analysis on page {page_number}...")
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Use robust drawing analysis with chunked processing
             drawings_count, drawings_data = self._analyze_page_drawings_robust(page, page_number)
-            analysis_time = time.time() - start_time
+            analysis_time = time.perf_counter() - start_time
             
             logger.info(f"  ✅ Drawing analysis completed: {drawings_count:,} drawings in {analysis_time:.1f}s")
             
         except Exception as e:
-            analysis_time = time.time() - start_time
+            analysis_time = time.perf_counter() - start_time
             logger.error(f"  ❌ Drawing analysis failed on page {page_number} after {analysis_time:.1f}s: {e}")
             # Don't give up - try alternative analysis
             try:
@@ -715,7 +715,7 @@ class PDFParser:
         """
         Optimized multi-threaded PDF parsing for large documents
         """
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         self.cancelled = False
         
         try:
@@ -750,7 +750,7 @@ class PDFParser:
                         logger.info(f"🧹 Memory cleanup after {batch_start} pages")
                 
                 # Create stats
-                processing_time = time.time() - self.start_time
+                processing_time = time.perf_counter() - self.start_time
                 stats = PDFParsingStats(
                     total_pages=self.total_pages,
                     pages_processed=self.processed_pages,
@@ -850,7 +850,7 @@ class PDFParser:
     def _report_progress(self):
         """Report processing progress"""
         if self.processed_pages % self.config.progress_report_interval == 0:
-            elapsed = time.time() - self.start_time
+            elapsed = time.perf_counter() - self.start_time
             pages_per_sec = self.processed_pages / elapsed if elapsed > 0 else 0
             remaining_pages = self.total_pages - self.processed_pages
             eta_seconds = remaining_pages / pages_per_sec if pages_per_sec > 0 else 0
@@ -124,7 +124,7 @@ class PDFVectorDatabase:
             return True
         
         logger.info(f"🔍 Indexing PDF file: {os.path.basename(pdf_file_path)}")
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Parse PDF into chunks
@@ -153,7 +153,7 @@ class PDFVectorDatabase:
             # Rebuild vector database with all chunks
             self.build_vector_database(self.chunks_data, force_rebuild=True)
             
-            indexing_time = time.time() - start_time
+            indexing_time = time.perf_counter() - start_time
             logger.info(f"✅ PDF indexing completed in {indexing_time:.1f} seconds")
             logger.info(f"   📊 Added {len(chunks)} chunks from {stats.pages_processed} pages")
             
@@ -189,9 +189,9 @@ class PDFVectorDatabase:
             texts_to_embed.append(text)
         
         logger.info("Creating embeddings...")
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.embeddings = self.model.encode(texts_to_embed, show_progress_bar=True)
-        embedding_time = time.time() - start_time
+        embedding_time = time.perf_counter() - start_time
         logger.info(f"Created {len(self.embeddings)} embeddings in {embedding_time:.2f} seconds")
         
         # Build FAISS index for fast similarity search (same as other DBs)
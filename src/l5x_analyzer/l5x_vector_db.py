@@ -267,9 +267,9 @@ class L5XVectorDatabase:
             texts_to_embed.append(text)
         
         logger.info("Creating embeddings...")
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.embeddings = self.model.encode(texts_to_embed, show_progress_bar=True)
-        embedding_time = time.time() - start_time
+        embedding_time = time.perf_counter() - start_time
         logger.info(f"Created {len(self.embeddings)} embeddings in {embedding_time:.2f} seconds")
         
         # Build FAISS index for fast similarity search
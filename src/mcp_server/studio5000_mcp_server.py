@@ -8,16 +8,28 @@ syntax, and best practices directly within AI conversations.
 """
 
 import asyncio
+import heapq
 import json
 import os
+import pickle
 import re
 import sys
-from typing import Any, Dict, List, Optional, Union
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Sequence, Union
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 import argparse
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -53,7 +65,46 @@ class MCPServer:
             "handler": handler
         }
 
-@dataclass
+# Instruction set index page listing the instruction categories
+MAIN_INDEX_FILE = "17691.htm"
+
+# Patterns applied to every documentation page
+_HREF_RE = re.compile(r'\d+\.htm')
+_INSTR_NAME_RE = re.compile(r'([A-Z]{2,}[A-Z0-9]*)')
+_LANG_IMG_RE = re.compile(r'o151\d+\.jpg')
+
+# Tool results are sent as compact JSON; set STUDIO5000_PRETTY_JSON=1 to indent them
+# for reading the raw protocol while debugging
+PRETTY_TOOL_RESULTS = os.environ.get('STUDIO5000_PRETTY_JSON') == '1'
+
+# Heading text (lowercase) that introduces syntax and example sections, in priority order
+SYNTAX_HEADINGS = ('syntax', 'parameters', 'operands')
+EXAMPLE_HEADINGS = ('example', 'sample', 'usage')
+
+# Tables with at least two header cells, one of which mentions parameters or operands
+# (ASCII case folding via translate; the header words are ASCII)
+_PARAMETER_TABLES = lxml.etree.XPath(
+    "//table[count(.//th) >= 2 and .//th["
+    "contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'parameter') or "
+    "contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'operand')]]"
+)
+_TABLE_ROWS_AFTER_HEADER = lxml.etree.XPath("(.//tr)[position() > 1]")
+
+# Bump when parsing changes so cached instruction indexes are rebuilt
+INDEX_CACHE_VERSION = 3
+
+# Documentation sets with at least this many pages are parsed in worker processes
+PARALLEL_MIN_FILES = 1000
+PARSE_BATCH_SIZE = 64
+
+# Language icon file names and the languages they mark, in reporting order
+_LANGUAGE_ICONS = (
+    ('o15168.jpg', 'Ladder Diagram'),
+    ('o15169.jpg', 'Function Block'),
+    ('o15170.jpg', 'Structured Text'),
+)
+
+@dataclass(slots=True, frozen=True)
 class Instruction:
     """Represents a Studio 5000 instruction"""
     name: str
@@ -68,33 +119,49 @@ class Instruction:
 class Studio5000Parser:
     """Parses Studio 5000 HTML documentation"""
     
-    def __init__(self, doc_root: str):
+    def __init__(self, doc_root: str, cache_dir: str = "instruction_index_cache"):
         self.doc_root = Path(doc_root)
+        self.cache_dir = Path(cache_dir)
+        self.index_cache = self.cache_dir / "instruction_index.pkl"
         self.instructions = {}
         self.categories = {}
+        self._html_parser = lxml.html.HTMLParser(encoding='utf-8')
         
     def parse_main_index(self) -> Dict[str, Any]:
         """Parse the main instruction set index"""
-        index_file = self.doc_root / "17691.htm"
+        index_file = self.doc_root / MAIN_INDEX_FILE
         if not index_file.exists():
             raise FileNotFoundError(f"Main index file not found: {index_file}")
         
-        with open(index_file, 'r', encoding='utf-8', errors='ignore') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
+        root = self._read_html(index_file)
         
         categories = {}
         
         # Find instruction category links
-        links = soup.find_all('a', href=re.compile(r'\d+\.htm'))
+        links = root.iter('a') if root is not None else ()
         for link in links:
-            if 'Instructions' in link.get_text():
-                category_name = link.get_text().strip()
-                category_file = link.get('href')
+            category_file = link.get('href')
+            if category_file and _HREF_RE.search(category_file) and 'Instructions' in link.text_content():
+                category_name = link.text_content().strip()
                 categories[category_name] = category_file
         
         self.categories = categories
         return categories
     
+    def _read_html(self, path: Path):
+        """
+        Parse an HTML file from its raw bytes, or return None if it is blank
+        
+        libxml2 decodes the bytes itself as UTF-8 (invalid sequences become U+FFFD);
+        its own detection is not used because it reads UTF-8 pages without a charset
+        declaration as Latin-1.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.strip():
+            return None
+        return lxml.html.document_fromstring(data, parser=self._html_parser)
+    
     def parse_instruction_file(self, file_path: str) -> Optional[Instruction]:
         """Parse an individual instruction file"""
         full_path = self.doc_root / file_path
@@ -102,122 +169,112 @@ class Studio5000Parser:
             return None
         
         try:
-            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
+            root = self._read_html(full_path)
+            if root is None:
+                return None
             
             # Extract title
-            title_elem = soup.find('title')
-            title = title_elem.get_text().strip() if title_elem else ""
+            title_elem = root.find('.//title')
+            title = title_elem.text_content().strip() if title_elem is not None else ""
             
             # Extract instruction name from title
-            match = re.search(r'([A-Z]{2,}[A-Z0-9]*)', title)
+            match = _INSTR_NAME_RE.search(title)
             instruction_name = match.group(1) if match else ""
             
             # Extract breadcrumb for category
-            breadcrumb = soup.find('p', class_='breadcrumbs')
+            breadcrumbs = root.xpath("//p[contains(concat(' ', normalize-space(@class), ' '), ' breadcrumbs ')]")
             category = ""
-            if breadcrumb:
-                links = breadcrumb.find_all('a')
-                for link in links:
-                    if 'Instructions' in link.get_text():
-                        category = link.get_text().strip()
+            if breadcrumbs:
+                for link in breadcrumbs[0].iter('a'):
+                    if 'Instructions' in link.text_content():
+                        category = link.text_content().strip()
                         break
             
             # Extract description from first paragraph
-            content_section = soup.find('div', id='content_section')
+            content_sections = root.xpath("//div[@id='content_section']")
             description = ""
-            if content_section:
-                first_p = content_section.find('p')
-                if first_p:
-                    description = first_p.get_text().strip()
+            if content_sections:
+                first_p = content_sections[0].find('.//p')
+                if first_p is not None:
+                    description = first_p.text_content().strip()
+            
+            # Determine supported languages from icons (based on the pattern seen in
+            # the documentation); icon file names are collected in one pass over the srcs
+            icons = {match.group(0) for src in root.xpath('//img/@src')
+                     for match in _LANG_IMG_RE.finditer(src)}
+            languages = [language for icon, language in _LANGUAGE_ICONS if icon in icons]
             
-            # Determine supported languages from icons
-            languages = []
-            img_tags = soup.find_all('img', src=re.compile(r'o151\d+\.jpg'))
-            if img_tags:
-                # Based on the pattern seen in the documentation
-                if any('o15168.jpg' in img.get('src', '') for img in img_tags):
-                    languages.append('Ladder Diagram')
-                if any('o15169.jpg' in img.get('src', '') for img in img_tags):
-                    languages.append('Function Block')
-                if any('o15170.jpg' in img.get('src', '') for img in img_tags):
-                    languages.append('Structured Text')
+            headings = self._find_headings(root, SYNTAX_HEADINGS + EXAMPLE_HEADINGS)
             
             return Instruction(
                 name=instruction_name,
-                category=category,
+                category=sys.intern(category),  # Shared by many instructions
                 description=description,
                 file_path=file_path,
                 languages=languages,
-                syntax=self._extract_syntax(soup),
-                parameters=self._extract_parameters(soup),
-                examples=self._extract_examples(soup)
+                syntax=self._extract_syntax(headings),
+                parameters=self._extract_parameters(root),
+                examples=self._extract_examples(headings)
             )
         
         except Exception as e:
-            import sys
             print(f"Error parsing {file_path}: {e}", file=sys.stderr)
             return None
     
-    def _extract_syntax(self, soup) -> Optional[str]:
+    def _find_headings(self, root, patterns: tuple) -> Dict[str, Any]:
+        """First h1-h4 heading containing each lowercase pattern, found in one pass"""
+        headings = {}
+        for heading in root.iter('h1', 'h2', 'h3', 'h4'):
+            text = heading.text_content().lower()
+            for pattern in patterns:
+                if pattern not in headings and pattern in text:
+                    headings[pattern] = heading
+            if len(headings) == len(patterns):
+                break
+        return headings
+    
+    def _extract_syntax(self, headings: Dict[str, Any]) -> Optional[str]:
         """Extract syntax information from the HTML"""
         # Look for syntax tables or code blocks
-        syntax_patterns = [
-            'Syntax',
-            'Parameters',
-            'Operands'
-        ]
-        
-        for pattern in syntax_patterns:
-            heading = soup.find(lambda tag: tag.name in ['h1', 'h2', 'h3', 'h4'] and 
-                              pattern.lower() in tag.get_text().lower())
-            if heading:
+        for pattern in SYNTAX_HEADINGS:
+            heading = headings.get(pattern)
+            if heading is not None:
                 # Get the next table or paragraph
-                next_elem = heading.find_next_sibling(['table', 'p', 'div'])
-                if next_elem:
-                    return next_elem.get_text().strip()
+                for next_elem in heading.itersiblings('table', 'p', 'div'):
+                    return next_elem.text_content().strip()
         
         return None
     
-    def _extract_parameters(self, soup) -> Optional[List[Dict]]:
+    def _extract_parameters(self, root) -> Optional[List[Dict]]:
         """Extract parameter information"""
         parameters = []
         
-        # Look for parameter tables
-        tables = soup.find_all('table')
-        for table in tables:
-            headers = table.find_all('th')
-            if len(headers) >= 2:
-                header_texts = [th.get_text().strip().lower() for th in headers]
-                if any('parameter' in h or 'operand' in h for h in header_texts):
-                    rows = table.find_all('tr')[1:]  # Skip header row
-                    for row in rows:
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 2:
-                            param = {
-                                'name': cells[0].get_text().strip(),
-                                'description': cells[1].get_text().strip()
-                            }
-                            if len(cells) > 2:
-                                param['type'] = cells[2].get_text().strip()
-                            parameters.append(param)
+        # Look for parameter tables (filtered by libxml2, not per header cell in Python)
+        for table in _PARAMETER_TABLES(root):
+            for row in _TABLE_ROWS_AFTER_HEADER(table):  # Skip header row
+                cells = list(row.iter('td', 'th'))
+                if len(cells) >= 2:
+                    param = {
+                        'name': cells[0].text_content().strip(),
+                        'description': cells[1].text_content().strip()
+                    }
+                    if len(cells) > 2:
+                        param['type'] = cells[2].text_content().strip()
+                    parameters.append(param)
         
         return parameters if parameters else None
     
-    def _extract_examples(self, soup) -> Optional[str]:
+    def _extract_examples(self, headings: Dict[str, Any]) -> Optional[str]:
         """Extract example information"""
-        example_patterns = ['example', 'sample', 'usage']
-        
-        for pattern in example_patterns:
-            heading = soup.find(lambda tag: tag.name in ['h1', 'h2', 'h3', 'h4'] and 
-                              pattern.lower() in tag.get_text().lower())
-            if heading:
+        for pattern in EXAMPLE_HEADINGS:
+            heading = headings.get(pattern)
+            if heading is not None:
                 example_content = []
-                current = heading.find_next_sibling()
-                while current and current.name not in ['h1', 'h2', 'h3', 'h4']:
-                    if current.name in ['p', 'pre', 'code', 'div']:
-                        example_content.append(current.get_text().strip())
-                    current = current.find_next_sibling()
+                for current in heading.itersiblings(lxml.etree.Element):
+                    if current.tag in ['h1', 'h2', 'h3', 'h4']:
+                        break
+                    if current.tag in ['p', 'pre', 'code', 'div']:
+                        example_content.append(current.text_content().strip())
                 
                 if example_content:
                     return '\n\n'.join(example_content)
@@ -226,21 +283,98 @@ class Studio5000Parser:
     
     def build_instruction_index(self) -> Dict[str, Instruction]:
         """Build a comprehensive index of all instructions"""
+        # Find all HTML files that might be instructions (normcase keeps glob's
+        # case-insensitive match on Windows)
+        with os.scandir(self.doc_root) as entries:
+            html_files = [entry for entry in entries
+                          if os.path.normcase(entry.name).endswith('.htm') and entry.is_file()]
+        
+        # Reuse the cached index while the documentation files are unchanged
+        fingerprint = self._index_fingerprint(html_files)
+        if self._load_index_cache(fingerprint):
+            return self.instructions
+        
         instructions = {}
         
         # Parse categories first
         self.parse_main_index()
         
-        # Find all HTML files that might be instructions
-        html_files = list(self.doc_root.glob("*.htm"))
+        # The index and category landing pages describe no single instruction
+        overview_files = {os.path.normcase(Path(urlparse(href).path).name)
+                          for href in self.categories.values()}
+        overview_files.add(os.path.normcase(MAIN_INDEX_FILE))
+        file_names = [html_file.name for html_file in html_files
+                      if os.path.normcase(html_file.name) not in overview_files]
+        workers = os.cpu_count() or 1
+        if len(file_names) >= PARALLEL_MIN_FILES and workers > 1:
+            # Pages are independent; parse batches in worker processes, keeping file order
+            batches = [file_names[start:start + PARSE_BATCH_SIZE]
+                       for start in range(0, len(file_names), PARSE_BATCH_SIZE)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = [instruction
+                          for batch in executor.map(_parse_instruction_batch, repeat(str(self.doc_root)), batches)
+                          for instruction in batch]
+        else:
+            parsed = map(self.parse_instruction_file, file_names)
         
-        for html_file in html_files:
-            instruction = self.parse_instruction_file(html_file.name)
+        for instruction in parsed:
             if instruction and instruction.name:
                 instructions[instruction.name.upper()] = instruction
         
         self.instructions = instructions
+        self._save_index_cache(fingerprint)
         return instructions
+    
+    def _index_fingerprint(self, html_files: List[os.DirEntry]) -> tuple:
+        """Name, modification time and size of every documentation file"""
+        entries = []
+        for html_file in html_files:
+            stat = html_file.stat()
+            entries.append((html_file.name, stat.st_mtime_ns, stat.st_size))
+        return (INDEX_CACHE_VERSION, str(self.doc_root.resolve()), tuple(sorted(entries)))
+    
+    def _load_index_cache(self, fingerprint: tuple) -> bool:
+        """Load instructions and categories from the cache if its fingerprint matches"""
+        if not self.index_cache.exists():
+            return False
+        
+        try:
+            with open(self.index_cache, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('fingerprint') != fingerprint:
+                return False
+            
+            self.categories = cached['categories']
+            self.instructions = {name: Instruction(**fields)
+                                 for name, fields in cached['instructions'].items()}
+            return True
+        
+        except Exception as e:
+            print(f"Error loading instruction index cache: {e}", file=sys.stderr)
+            return False
+    
+    def _save_index_cache(self, fingerprint: tuple):
+        """Persist the parsed index; instructions are stored as plain dicts"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cached = {
+                'fingerprint': fingerprint,
+                'categories': self.categories,
+                'instructions': {name: asdict(instruction)
+                                 for name, instruction in self.instructions.items()}
+            }
+            tmp_path = self.index_cache.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_cache)
+        
+        except Exception as e:
+            print(f"Error saving instruction index cache: {e}", file=sys.stderr)
+
+def _parse_instruction_batch(doc_root: str, file_names: List[str]) -> List[Optional[Instruction]]:
+    """Worker entry point: parse a batch of instruction pages"""
+    parser = Studio5000Parser(doc_root)
+    return [parser.parse_instruction_file(file_name) for file_name in file_names]
 
 class Studio5000MCPServer:
     """MCP Server for Studio 5000 documentation"""
@@ -251,6 +385,17 @@ class Studio5000MCPServer:
         self.server = MCPServer("studio5000-ai-assistant", "2.0.0")
         self.instructions = {}
         
+        # Trigram postings for the basic instruction search (see _build_search_index)
+        self._search_instructions = []
+        self._search_fields = []
+        self._category_positions = {}
+        self._name_trigrams = {}
+        self._description_trigrams = {}
+        
+        # Fallback category listings (see _build_category_index)
+        self._sorted_categories = []
+        self._by_category = {}
+        
         # Initialize new components
         self.l5x_generator = L5XGenerator()
         self.code_assistant = CodeAssistant(mcp_server=self)
@@ -277,17 +422,20 @@ class Studio5000MCPServer:
         self.tag_integration = TagMCPIntegration()
         self.tag_tools = TagMCPTools
         
-        # Initialize and index the documentation
-        self._initialize()
+        # Documentation is indexed by start(), off the event loop
+    
+    async def start(self):
+        """Index the documentation and register tools without blocking the event loop"""
+        await asyncio.to_thread(self._initialize)
     
     async def _ensure_instruction_db_ready(self):
         """Ensure the instruction vector database is fully initialized"""
-        # Database is now initialized synchronously in __init__, so this is a no-op
+        # Database is initialized by start() before tools are served, so this is a no-op
         pass
     
     async def _ensure_sdk_db_ready(self):
         """Ensure the SDK vector database is fully initialized"""
-        # Database is now initialized synchronously in __init__, so this is a no-op
+        # Database is initialized by start() before tools are served, so this is a no-op
         pass
     
     def _initialize(self):
@@ -297,6 +445,8 @@ class Studio5000MCPServer:
         import sys
         print("Indexing Studio 5000 documentation...", file=sys.stderr)
         self.instructions = self.parser.build_instruction_index()
+        self._build_search_index()
+        self._build_category_index()
         print(f"Indexed {len(self.instructions)} instructions", file=sys.stderr)
         
         # Initialize instruction vector database - use blocking approach for immediate initialization
@@ -680,6 +830,9 @@ class Studio5000MCPServer:
             "Get all sensor tags",
             self.get_sensor_tags
         )
+        
+        # Tool schemas never change after registration; build tools/list once
+        self._tools_list_response = _build_tools_list(self)
     
     async def search_instructions(self, query: str, category: Optional[str] = None) -> List[Dict]:
         """Enhanced search for instructions using vector database"""
@@ -702,27 +855,97 @@ class Studio5000MCPServer:
             print(f"Vector search error, using fallback: {e}", file=sys.stderr)
             return self._basic_search_instructions(query, category)
     
+    def _build_search_index(self):
+        """
+        Index lowercased instruction names and descriptions by character trigram
+        
+        Any substring of three or more characters has all of its trigrams in the
+        text containing it, so intersecting postings yields every instruction the
+        basic search can match; the substring checks then confirm each candidate.
+        """
+        self._search_instructions = list(self.instructions.values())
+        # (name, description) lowercased once instead of on every search
+        self._search_fields = [(instruction.name.lower(), (instruction.description or '').lower())
+                               for instruction in self._search_instructions]
+        
+        # Positions per lowercased category, so a category filter never visits other instructions
+        category_positions = defaultdict(list)
+        for position, instruction in enumerate(self._search_instructions):
+            category_positions[instruction.category.lower()].append(position)
+        self._category_positions = dict(category_positions)
+        
+        name_trigrams = defaultdict(set)
+        description_trigrams = defaultdict(set)
+        
+        for position, (name_lower, description_lower) in enumerate(self._search_fields):
+            for postings, text in ((name_trigrams, name_lower),
+                                   (description_trigrams, description_lower)):
+                for start in range(len(text) - 2):
+                    postings[text[start:start + 3]].add(position)
+        
+        self._name_trigrams = dict(name_trigrams)
+        self._description_trigrams = dict(description_trigrams)
+    
+    def _build_category_index(self):
+        """Precompute the sorted category list and per-category listings used as fallbacks"""
+        categories = set()
+        by_category = defaultdict(list)
+        for instruction in self.instructions.values():
+            if instruction.category:
+                categories.add(instruction.category)
+            by_category[instruction.category.lower()].append({
+                'name': instruction.name,
+                'description': instruction.description,
+                'languages': instruction.languages,
+                'search_type': 'direct_fallback'
+            })
+        
+        self._sorted_categories = sorted(categories)
+        self._by_category = {category: sorted(results, key=lambda x: x['name'])
+                             for category, results in by_category.items()}
+    
+    def _search_candidates(self, query_lower: str, category_lower: Optional[str] = None) -> Sequence[int]:
+        """
+        Positions of instructions whose name or description may contain query_lower,
+        restricted to category_lower when given, in index order
+        """
+        in_category = self._category_positions.get(category_lower, []) if category_lower else None
+        if len(query_lower) < 3:
+            return in_category if in_category is not None else range(len(self._search_instructions))
+        
+        trigrams = {query_lower[start:start + 3] for start in range(len(query_lower) - 2)}
+        positions = set()
+        for postings in (self._name_trigrams, self._description_trigrams):
+            matches = [postings.get(trigram) for trigram in trigrams]
+            if all(matches):
+                positions.update(set.intersection(*matches))
+        if in_category is not None:
+            positions.intersection_update(in_category)
+        
+        return sorted(positions)
+    
     def _basic_search_instructions(self, query: str, category: Optional[str] = None) -> List[Dict]:
         """Fallback basic search for instructions (original implementation)"""
         results = []
         query_lower = query.lower()
+        category_lower = category.lower() if category else None
         
-        for name, instruction in self.instructions.items():
+        # Category filter is applied by the candidate lookup
+        for position in self._search_candidates(query_lower, category_lower):
+            name_lower, description_lower = self._search_fields[position]
+            
             match_score = 0
             
             # Name match (highest priority)
-            if query_lower in instruction.name.lower():
+            if query_lower in name_lower:
                 match_score += 10
             
             # Description match
-            if instruction.description and query_lower in instruction.description.lower():
+            if description_lower and query_lower in description_lower:
                 match_score += 5
             
-            # Category filter
-            if category and instruction.category.lower() != category.lower():
-                continue
-            
             if match_score > 0:
+                instruction = self._search_instructions[position]
                 results.append({
                     'name': instruction.name,
                     'category': instruction.category,
@@ -732,9 +955,8 @@ class Studio5000MCPServer:
                     'search_type': 'basic_fallback'
                 })
         
-        # Sort by match score
-        results.sort(key=lambda x: x['match_score'], reverse=True)
-        return results[:20]  # Limit to top 20 results
+        # Top 20 by match score (nlargest is stable, like the full sort it replaces)
+        return heapq.nlargest(20, results, key=lambda x: x['match_score'])
     
     async def get_instruction(self, name: str) -> Optional[Dict]:
         """Get detailed information about a specific instruction using vector database"""
@@ -793,18 +1015,10 @@ class Studio5000MCPServer:
                 return vector_result.get('categories', [])
             
             # Fallback to direct enumeration
-            categories = set()
-            for instruction in self.instructions.values():
-                if instruction.category:
-                    categories.add(instruction.category)
-            return sorted(list(categories))
+            return list(self._sorted_categories)
         except Exception as e:
             # Fallback to direct enumeration
-            categories = set()
-            for instruction in self.instructions.values():
-                if instruction.category:
-                    categories.add(instruction.category)
-            return sorted(list(categories))
+            return list(self._sorted_categories)
     
     async def list_instructions_by_category(self, category: str) -> List[Dict]:
         """List all instructions in a specific category using vector database"""
@@ -818,34 +1032,10 @@ class Studio5000MCPServer:
                 return vector_result.get('instructions', [])
             
             # Fallback to direct enumeration
-            results = []
-            category_lower = category.lower()
-            
-            for instruction in self.instructions.values():
-                if instruction.category.lower() == category_lower:
-                    results.append({
-                        'name': instruction.name,
-                        'description': instruction.description,
-                        'languages': instruction.languages,
-                        'search_type': 'direct_fallback'
-                    })
-            
-            return sorted(results, key=lambda x: x['name'])
+            return list(self._by_category.get(category.lower(), []))
         except Exception as e:
             # Fallback to direct enumeration
-            results = []
-            category_lower = category.lower()
-            
-            for instruction in self.instructions.values():
-                if instruction.category.lower() == category_lower:
-                    results.append({
-                        'name': instruction.name,
-                        'description': instruction.description,
-                        'languages': instruction.languages,
-                        'search_type': 'direct_fallback'
-                    })
-            
-            return sorted(results, key=lambda x: x['name'])
+            return list(self._by_category.get(category.lower(), []))
     
     async def get_instruction_syntax(self, name: str) -> Optional[Dict]:
         """Get syntax and parameter information for an instruction using vector database"""
@@ -1283,19 +1473,20 @@ class Studio5000MCPServer:
     async def search_tags(self, query: str, category_filter: str = None, 
                          chunk_type_filter: str = None, limit: int = 20) -> Dict[str, Any]:
         """Search through indexed tags using natural language"""
-        return await self.tag_integration.search_tags(query, category_filter, chunk_type_filter, limit)
+        return await self.tag_integration.search_tags(query, category_filter, chunk_type_filter, limit,
+                                                     encoded=True)
     
     async def find_device(self, device_description: str, device_type: str = None) -> Dict[str, Any]:
         """Find specific devices by description or function"""
-        return await self.tag_integration.find_device(device_description, device_type)
+        return await self.tag_integration.find_device(device_description, device_type, encoded=True)
     
     async def get_module_tags(self, rack: int, slot: int) -> Dict[str, Any]:
         """Get all tags for a specific module (rack/slot)"""
-        return await self.tag_integration.get_module_tags(rack, slot)
+        return await self.tag_integration.get_module_tags(rack, slot, encoded=True)
     
     async def find_i_o_point(self, address_pattern: str = None, description: str = None) -> Dict[str, Any]:
         """Find specific I/O points by address or description"""
-        return await self.tag_integration.find_i_o_point(address_pattern, description)
+        return await self.tag_integration.find_i_o_point(address_pattern, description, encoded=True)
     
     async def analyze_i_o_usage(self) -> Dict[str, Any]:
         """Analyze I/O usage and capacity across the system"""
@@ -1303,7 +1494,7 @@ class Studio5000MCPServer:
     
     async def find_related_tags(self, tag_name: str, relationship_type: str = "all") -> Dict[str, Any]:
         """Find tags related to a given tag"""
-        return await self.tag_integration.find_related_tags(tag_name, relationship_type)
+        return await self.tag_integration.find_related_tags(tag_name, relationship_type, encoded=True)
     
     async def get_device_overview(self, category_filter: str = None) -> Dict[str, Any]:
         """Get comprehensive overview of devices in the system"""
@@ -1322,6 +1513,287 @@ class Studio5000MCPServer:
         return await self.tag_integration.get_sensor_tags()
 
 # JSON-RPC 2.0 MCP Protocol Implementation
+def _build_tools_list(server: Studio5000MCPServer) -> List[Dict]:
+    """Build the tools/list entries, with input schemas, for every registered tool"""
+    tools = []
+    for name, tool in server.server.tools.items():
+        # Build properties and required fields based on tool name
+        properties = {}
+        required = []
+        
+        if name == 'search_instructions':
+            properties = {
+                'query': {'type': 'string', 'description': 'Search query'},
+                'category': {'type': 'string', 'description': 'Optional category filter'}
+            }
+            required = ['query']
+        elif name in ['get_instruction', 'get_instruction_syntax']:
+            properties = {
+                'name': {'type': 'string', 'description': 'Instruction name'}
+            }
+            required = ['name']
+        elif name == 'list_instructions_by_category':
+            properties = {
+                'category': {'type': 'string', 'description': 'Category name'}
+            }
+            required = ['category']
+        elif name == 'generate_ladder_logic':
+            properties = {
+                'specification': {'type': 'string', 'description': 'Natural language specification for PLC logic'}
+            }
+            required = ['specification']
+        elif name == 'create_l5x_project':
+            properties = {
+                'project_spec': {
+                    'type': 'object',
+                    'description': 'Project specification',
+                    'properties': {
+                        'name': {'type': 'string', 'description': 'Project name'},
+                        'controller_type': {'type': 'string', 'description': 'Controller type (e.g., 1756-L83E)'},
+                        'specification': {'type': 'string', 'description': 'Natural language specification'},
+                        'save_path': {'type': 'string', 'description': 'Optional file path to save L5X file'}
+                    }
+                }
+            }
+            required = ['project_spec']
+        elif name == 'create_l5x_routine':
+            properties = {
+                'routine_spec': {
+                    'type': 'object',
+                    'description': 'Routine specification for export',
+                    'properties': {
+                        'name': {'type': 'string', 'description': 'Routine name'},
+                        'controller_name': {'type': 'string', 'description': 'Existing controller name (e.g., MTN6_MCM06)'},
+                        'specification': {'type': 'string', 'description': 'Natural language specification for routine logic'},
+                        'software_revision': {'type': 'string', 'description': 'Studio 5000 software revision (default: 36.02)'},
+                        'save_path': {'type': 'string', 'description': 'File path to save routine L5X export'}
+                    }
+                }
+            }
+            required = ['routine_spec']
+        elif name == 'validate_ladder_logic':
+            properties = {
+                'logic_spec': {
+                    'type': 'object',
+                    'description': 'Ladder logic specification to validate using fast, reliable validation',
+                    'properties': {
+                        'ladder_logic': {'type': 'string', 'description': 'Ladder logic code to validate'},
+                        'instructions_used': {'type': 'array', 'description': 'List of instructions used (optional)'},
+                        'controller_type': {'type': 'string', 'description': 'Controller type for validation (optional, default: 1756-L83E)'}
+                    }
+                }
+            }
+            required = ['logic_spec']
+        elif name == 'create_acd_project':
+            properties = {
+                'project_spec': {
+                    'type': 'object',
+                    'description': 'ACD project specification',
+                    'properties': {
+                        'name': {'type': 'string', 'description': 'Project name'},
+                        'controller_type': {'type': 'string', 'description': 'Controller type (e.g., 1756-L83E)'},
+                        'major_revision': {'type': 'integer', 'description': 'Studio 5000 major revision (default 36)'},
+                        'save_path': {'type': 'string', 'description': 'File path to save .ACD file'}
+                    }
+                }
+            }
+            required = ['project_spec']
+        elif name == 'search_sdk_documentation':
+            properties = {
+                'query': {'type': 'string', 'description': 'Natural language query to search SDK documentation'},
+                'limit': {'type': 'integer', 'description': 'Maximum number of results to return (default: 10)'}
+            }
+            required = ['query']
+        elif name == 'get_sdk_operation_info':
+            properties = {
+                'name': {'type': 'string', 'description': 'Name of the SDK operation to get details for'},
+                'operation_type': {'type': 'string', 'description': 'Optional operation type filter (method, class, enum, example)'}
+            }
+            required = ['name']
+        elif name == 'list_sdk_categories':
+            properties = {}
+            required = []
+        elif name == 'get_sdk_operations_by_category':
+            properties = {
+                'category': {'type': 'string', 'description': 'SDK operation category name'}
+            }
+            required = ['category']
+        elif name == 'get_logix_project_methods':
+            properties = {
+                'method_category': {'type': 'string', 'description': 'Optional category to filter LogixProject methods by'}
+            }
+            required = []
+        elif name == 'suggest_sdk_operations':
+            properties = {
+                'context': {'type': 'string', 'description': 'Context or description of what you want to accomplish'}
+            }
+            required = ['context']
+        elif name == 'get_sdk_statistics':
+            properties = {}
+            required = []
+        # L5X Analyzer Tools  
+        elif name == 'index_exported_l5x_files':
+            properties = {
+                'l5x_directory': {'type': 'string', 'description': 'Directory containing exported L5X files'},
+                'force_rebuild': {'type': 'boolean', 'description': 'Force rebuild even if cached (default: false)'}
+            }
+            required = ['l5x_directory']
+        elif name == 'index_acd_project':
+            properties = {
+                'acd_path': {'type': 'string', 'description': 'Path to ACD or L5K file to index'},
+                'routines_to_index': {'type': 'array', 'description': 'Optional list of specific routines to index (null for all)'},
+                'force_rebuild': {'type': 'boolean', 'description': 'Force rebuild even if cached (default: false)'}
+            }
+            required = ['acd_path']
+        elif name == 'search_l5x_content':
+            properties = {
+                'query': {'type': 'string', 'description': 'Natural language search query'},
+                'file_filter': {'type': 'string', 'description': 'Optional filter by project file name'},
+                'component_type': {'type': 'string', 'description': 'Optional filter by component type (routine, rung, udt, etc.)'},
+                'limit': {'type': 'integer', 'description': 'Maximum results to return (default: 20)'}
+            }
+            required = ['query']
+        elif name == 'find_insertion_point':
+            properties = {
+                'new_logic_description': {'type': 'string', 'description': 'Description of logic to insert'},
+                'target_routine': {'type': 'string', 'description': 'Target routine name'},
+                'target_file': {'type': 'string', 'description': 'Optional target file filter'}
+            }
+            required = ['new_logic_description', 'target_routine']
+        elif name == 'smart_insert_logic':
+            properties = {
+                'acd_path': {'type': 'string', 'description': 'Path to ACD/L5K file'},
+                'routine_name': {'type': 'string', 'description': 'Target routine name'},
+                'logic_description': {'type': 'string', 'description': 'Natural language description of logic to generate and insert'},
+                'program_name': {'type': 'string', 'description': 'Parent program name (default: MainProgram)'},
+                'insertion_mode': {'type': 'string', 'description': 'Insertion mode: optimal or end (default: optimal)'}
+            }
+            required = ['acd_path', 'routine_name', 'logic_description']
+        elif name == 'extract_routine_content':
+            properties = {
+                'acd_path': {'type': 'string', 'description': 'Path to ACD/L5K file'},
+                'routine_name': {'type': 'string', 'description': 'Routine to extract'},
+                'program_name': {'type': 'string', 'description': 'Parent program name (default: MainProgram)'},
+                'output_format': {'type': 'string', 'description': 'Output format: summary, full, or rungs_only (default: summary)'}
+            }
+            required = ['acd_path', 'routine_name']
+        elif name == 'analyze_routine_structure':
+            properties = {
+                'routine_name': {'type': 'string', 'description': 'Name of routine to analyze'}
+            }
+            required = ['routine_name']
+        elif name == 'find_related_components':
+            properties = {
+                'component_name': {'type': 'string', 'description': 'Name of component to find relationships for'},
+                'project_filter': {'type': 'string', 'description': 'Optional project file filter'},
+                'relationship_type': {'type': 'string', 'description': 'Type of relationship: usage, dependency, or similar (default: usage)'}
+            }
+            required = ['component_name']
+        elif name == 'get_project_overview':
+            properties = {
+                'acd_path': {'type': 'string', 'description': 'Path to ACD/L5K file'}
+            }
+            required = ['acd_path']
+        
+        # PDF Drawings Tool Parameters
+        elif name == 'index_pdf_drawings':
+            properties = {
+                'pdf_file_path': {'type': 'string', 'description': 'Path to PDF file containing technical drawings'},
+                'force_rebuild': {'type': 'boolean', 'description': 'Force re-indexing even if cached (default: false)'},
+                'use_vision_ai': {'type': 'boolean', 'description': 'Enable advanced vision AI analysis (default: false)'},
+                'max_pages': {'type': 'integer', 'description': 'Limit processing to first N pages for testing (optional)'}
+            }
+            required = ['pdf_file_path']
+        elif name == 'search_drawings':
+            properties = {
+                'query': {'type': 'string', 'description': 'Natural language search query'},
+                'limit': {'type': 'integer', 'description': 'Maximum number of results (default: 10)'},
+                'score_threshold': {'type': 'number', 'description': 'Minimum relevance score 0.0-1.0 (default: 0.3)'},
+                'drawing_type_filter': {'type': 'string', 'description': 'Filter by type: electrical, pid, layout, control_logic, etc.'},
+                'equipment_filter': {'type': 'string', 'description': 'Filter by equipment tag'}
+            }
+            required = ['query']
+        elif name == 'find_equipment_context':
+            properties = {
+                'equipment_tag': {'type': 'string', 'description': 'Equipment identifier (e.g., MCM01, PDP01, M001)'},
+                'context_type': {'type': 'string', 'description': 'Context type: electrical, process, safety, control (optional)'}
+            }
+            required = ['equipment_tag']
+        elif name == 'get_drawing_details':
+            properties = {
+                'drawing_number': {'type': 'string', 'description': 'Drawing reference number (optional)'},
+                'page_number': {'type': 'integer', 'description': 'Page number to retrieve (optional)'}
+            }
+            required = []  # At least one parameter required, but handled in logic
+        elif name == 'get_equipment_connections':
+            properties = {
+                'equipment_tag': {'type': 'string', 'description': 'Equipment identifier to find connections for'}
+            }
+            required = ['equipment_tag']
+        
+        # Tag Analyzer Tool Parameters
+        elif name == 'index_tag_csv':
+            properties = {
+                'csv_path': {'type': 'string', 'description': 'Path to Studio 5000 tag CSV export file'},
+                'force_rebuild': {'type': 'boolean', 'description': 'Force rebuild even if cached (default: false)'}
+            }
+            required = ['csv_path']
+        elif name == 'search_tags':
+            properties = {
+                'query': {'type': 'string', 'description': 'Natural language search query'},
+                'category_filter': {'type': 'string', 'description': 'Filter by device category (VFD, Safety, DI, DO, etc.)'},
+                'chunk_type_filter': {'type': 'string', 'description': 'Filter by chunk type (safety_tag, motor_tag, sensor_tag, etc.)'},
+                'limit': {'type': 'integer', 'description': 'Maximum results to return (default: 20)'}
+            }
+            required = ['query']
+        elif name == 'find_device':
+            properties = {
+                'device_description': {'type': 'string', 'description': 'Description of device to find'},
+                'device_type': {'type': 'string', 'description': 'Optional device type filter'}
+            }
+            required = ['device_description']
+        elif name == 'get_module_tags':
+            properties = {
+                'rack': {'type': 'integer', 'description': 'Rack number'},
+                'slot': {'type': 'integer', 'description': 'Slot number'}
+            }
+            required = ['rack', 'slot']
+        elif name == 'find_i_o_point':
+            properties = {
+                'address_pattern': {'type': 'string', 'description': 'I/O address pattern to search for (optional)'},
+                'description': {'type': 'string', 'description': 'Description to search for (optional)'}
+            }
+            required = []  # At least one parameter required, handled in logic
+        elif name == 'analyze_i_o_usage':
+            properties = {}
+            required = []
+        elif name == 'find_related_tags':
+            properties = {
+                'tag_name': {'type': 'string', 'description': 'Tag name to find relationships for'},
+                'relationship_type': {'type': 'string', 'description': 'Type of relationship (all, functional, physical)'}
+            }
+            required = ['tag_name']
+        elif name == 'get_device_overview':
+            properties = {
+                'category_filter': {'type': 'string', 'description': 'Optional category filter'}
+            }
+            required = []
+        elif name in ['get_safety_tags', 'get_motor_tags', 'get_sensor_tags']:
+            properties = {}
+            required = []
+        
+        tools.append({
+            'name': name,
+            'description': tool['description'],
+            'inputSchema': {
+                'type': 'object',
+                'properties': properties,
+                'required': required
+            }
+        })
+    
+    return tools
+
 async def handle_mcp_request(server: Studio5000MCPServer, request: Dict) -> Optional[Dict]:
     """Handle an MCP request"""
     method = request.get('method')
@@ -1354,284 +1826,7 @@ async def handle_mcp_request(server: Studio5000MCPServer, request: Dict) -> Opti
         return response
     
     elif method == 'tools/list':
-        tools = []
-        for name, tool in server.server.tools.items():
-            # Build properties and required fields based on tool name
-            properties = {}
-            required = []
-            
-            if name == 'search_instructions':
-                properties = {
-                    'query': {'type': 'string', 'description': 'Search query'},
-                    'category': {'type': 'string', 'description': 'Optional category filter'}
-                }
-                required = ['query']
-            elif name in ['get_instruction', 'get_instruction_syntax']:
-                properties = {
-                    'name': {'type': 'string', 'description': 'Instruction name'}
-                }
-                required = ['name']
-            elif name == 'list_instructions_by_category':
-                properties = {
-                    'category': {'type': 'string', 'description': 'Category name'}
-                }
-                required = ['category']
-            elif name == 'generate_ladder_logic':
-                properties = {
-                    'specification': {'type': 'string', 'description': 'Natural language specification for PLC logic'}
-                }
-                required = ['specification']
-            elif name == 'create_l5x_project':
-                properties = {
-                    'project_spec': {
-                        'type': 'object',
-                        'description': 'Project specification',
-                        'properties': {
-                            'name': {'type': 'string', 'description': 'Project name'},
-                            'controller_type': {'type': 'string', 'description': 'Controller type (e.g., 1756-L83E)'},
-                            'specification': {'type': 'string', 'description': 'Natural language specification'},
-                            'save_path': {'type': 'string', 'description': 'Optional file path to save L5X file'}
-                        }
-                    }
-                }
-                required = ['project_spec']
-            elif name == 'create_l5x_routine':
-                properties = {
-                    'routine_spec': {
-                        'type': 'object',
-                        'description': 'Routine specification for export',
-                        'properties': {
-                            'name': {'type': 'string', 'description': 'Routine name'},
-                            'controller_name': {'type': 'string', 'description': 'Existing controller name (e.g., MTN6_MCM06)'},
-                            'specification': {'type': 'string', 'description': 'Natural language specification for routine logic'},
-                            'software_revision': {'type': 'string', 'description': 'Studio 5000 software revision (default: 36.02)'},
-                            'save_path': {'type': 'string', 'description': 'File path to save routine L5X export'}
-                        }
-                    }
-                }
-                required = ['routine_spec']
-            elif name == 'validate_ladder_logic':
-                properties = {
-                    'logic_spec': {
-                        'type': 'object',
-                        'description': 'Ladder logic specification to validate using fast, reliable validation',
-                        'properties': {
-                            'ladder_logic': {'type': 'string', 'description': 'Ladder logic code to validate'},
-                            'instructions_used': {'type': 'array', 'description': 'List of instructions used (optional)'},
-                            'controller_type': {'type': 'string', 'description': 'Controller type for validation (optional, default: 1756-L83E)'}
-                        }
-                    }
-                }
-                required = ['logic_spec']
-            elif name == 'create_acd_project':
-                properties = {
-                    'project_spec': {
-                        'type': 'object',
-                        'description': 'ACD project specification',
-                        'properties': {
-                            'name': {'type': 'string', 'description': 'Project name'},
-                            'controller_type': {'type': 'string', 'description': 'Controller type (e.g., 1756-L83E)'},
-                            'major_revision': {'type': 'integer', 'description': 'Studio 5000 major revision (default 36)'},
-                            'save_path': {'type': 'string', 'description': 'File path to save .ACD file'}
-                        }
-                    }
-                }
-                required = ['project_spec']
-            elif name == 'search_sdk_documentation':
-                properties = {
-                    'query': {'type': 'string', 'description': 'Natural language query to search SDK documentation'},
-                    'limit': {'type': 'integer', 'description': 'Maximum number of results to return (default: 10)'}
-                }
-                required = ['query']
-            elif name == 'get_sdk_operation_info':
-                properties = {
-                    'name': {'type': 'string', 'description': 'Name of the SDK operation to get details for'},
-                    'operation_type': {'type': 'string', 'description': 'Optional operation type filter (method, class, enum, example)'}
-                }
-                required = ['name']
-            elif name == 'list_sdk_categories':
-                properties = {}
-                required = []
-            elif name == 'get_sdk_operations_by_category':
-                properties = {
-                    'category': {'type': 'string', 'description': 'SDK operation category name'}
-                }
-                required = ['category']
-            elif name == 'get_logix_project_methods':
-                properties = {
-                    'method_category': {'type': 'string', 'description': 'Optional category to filter LogixProject methods by'}
-                }
-                required = []
-            elif name == 'suggest_sdk_operations':
-                properties = {
-                    'context': {'type': 'string', 'description': 'Context or description of what you want to accomplish'}
-                }
-                required = ['context']
-            elif name == 'get_sdk_statistics':
-                properties = {}
-                required = []
-            # L5X Analyzer Tools  
-            elif name == 'index_exported_l5x_files':
-                properties = {
-                    'l5x_directory': {'type': 'string', 'description': 'Directory containing exported L5X files'},
-                    'force_rebuild': {'type': 'boolean', 'description': 'Force rebuild even if cached (default: false)'}
-                }
-                required = ['l5x_directory']
-            elif name == 'index_acd_project':
-                properties = {
-                    'acd_path': {'type': 'string', 'description': 'Path to ACD or L5K file to index'},
-                    'routines_to_index': {'type': 'array', 'description': 'Optional list of specific routines to index (null for all)'},
-                    'force_rebuild': {'type': 'boolean', 'description': 'Force rebuild even if cached (default: false)'}
-                }
-                required = ['acd_path']
-            elif name == 'search_l5x_content':
-                properties = {
-                    'query': {'type': 'string', 'description': 'Natural language search query'},
-                    'file_filter': {'type': 'string', 'description': 'Optional filter by project file name'},
-                    'component_type': {'type': 'string', 'description': 'Optional filter by component type (routine, rung, udt, etc.)'},
-                    'limit': {'type': 'integer', 'description': 'Maximum results to return (default: 20)'}
-                }
-                required = ['query']
-            elif name == 'find_insertion_point':
-                properties = {
-                    'new_logic_description': {'type': 'string', 'description': 'Description of logic to insert'},
-                    'target_routine': {'type': 'string', 'description': 'Target routine name'},
-                    'target_file': {'type': 'string', 'description': 'Optional target file filter'}
-                }
-                required = ['new_logic_description', 'target_routine']
-            elif name == 'smart_insert_logic':
-                properties = {
-                    'acd_path': {'type': 'string', 'description': 'Path to ACD/L5K file'},
-                    'routine_name': {'type': 'string', 'description': 'Target routine name'},
-                    'logic_description': {'type': 'string', 'description': 'Natural language description of logic to generate and insert'},
-                    'program_name': {'type': 'string', 'description': 'Parent program name (default: MainProgram)'},
-                    'insertion_mode': {'type': 'string', 'description': 'Insertion mode: optimal or end (default: optimal)'}
-                }
-                required = ['acd_path', 'routine_name', 'logic_description']
-            elif name == 'extract_routine_content':
-                properties = {
-                    'acd_path': {'type': 'string', 'description': 'Path to ACD/L5K file'},
-                    'routine_name': {'type': 'string', 'description': 'Routine to extract'},
-                    'program_name': {'type': 'string', 'description': 'Parent program name (default: MainProgram)'},
-                    'output_format': {'type': 'string', 'description': 'Output format: summary, full, or rungs_only (default: summary)'}
-                }
-                required = ['acd_path', 'routine_name']
-            elif name == 'analyze_routine_structure':
-                properties = {
-                    'routine_name': {'type': 'string', 'description': 'Name of routine to analyze'}
-                }
-                required = ['routine_name']
-            elif name == 'find_related_components':
-                properties = {
-                    'component_name': {'type': 'string', 'description': 'Name of component to find relationships for'},
-                    'project_filter': {'type': 'string', 'description': 'Optional project file filter'},
-                    'relationship_type': {'type': 'string', 'description': 'Type of relationship: usage, dependency, or similar (default: usage)'}
-                }
-                required = ['component_name']
-            elif name == 'get_project_overview':
-                properties = {
-                    'acd_path': {'type': 'string', 'description': 'Path to ACD/L5K file'}
-                }
-                required = ['acd_path']
-            
-            # PDF Drawings Tool Parameters
-            elif name == 'index_pdf_drawings':
-                properties = {
-                    'pdf_file_path': {'type': 'string', 'description': 'Path to PDF file containing technical drawings'},
-                    'force_rebuild': {'type': 'boolean', 'description': 'Force re-indexing even if cached (default: false)'},
-                    'use_vision_ai': {'type': 'boolean', 'description': 'Enable advanced vision AI analysis (default: false)'},
-                    'max_pages': {'type': 'integer', 'description': 'Limit processing to first N pages for testing (optional)'}
-                }
-                required = ['pdf_file_path']
-            elif name == 'search_drawings':
-                properties = {
-                    'query': {'type': 'string', 'description': 'Natural language search query'},
-                    'limit': {'type': 'integer', 'description': 'Maximum number of results (default: 10)'},
-                    'score_threshold': {'type': 'number', 'description': 'Minimum relevance score 0.0-1.0 (default: 0.3)'},
-                    'drawing_type_filter': {'type': 'string', 'description': 'Filter by type: electrical, pid, layout, control_logic, etc.'},
-                    'equipment_filter': {'type': 'string', 'description': 'Filter by equipment tag'}
-                }
-                required = ['query']
-            elif name == 'find_equipment_context':
-                properties = {
-                    'equipment_tag': {'type': 'string', 'description': 'Equipment identifier (e.g., MCM01, PDP01, M001)'},
-                    'context_type': {'type': 'string', 'description': 'Context type: electrical, process, safety, control (optional)'}
-                }
-                required = ['equipment_tag']
-            elif name == 'get_drawing_details':
-                properties = {
-                    'drawing_number': {'type': 'string', 'description': 'Drawing reference number (optional)'},
-                    'page_number': {'type': 'integer', 'description': 'Page number to retrieve (optional)'}
-                }
-                required = []  # At least one parameter required, but handled in logic
-            elif name == 'get_equipment_connections':
-                properties = {
-                    'equipment_tag': {'type': 'string', 'description': 'Equipment identifier to find connections for'}
-                }
-                required = ['equipment_tag']
-            
-            # Tag Analyzer Tool Parameters
-            elif name == 'index_tag_csv':
-                properties = {
-                    'csv_path': {'type': 'string', 'description': 'Path to Studio 5000 tag CSV export file'},
-                    'force_rebuild': {'type': 'boolean', 'description': 'Force rebuild even if cached (default: false)'}
-                }
-                required = ['csv_path']
-            elif name == 'search_tags':
-                properties = {
-                    'query': {'type': 'string', 'description': 'Natural language search query'},
-                    'category_filter': {'type': 'string', 'description': 'Filter by device category (VFD, Safety, DI, DO, etc.)'},
-                    'chunk_type_filter': {'type': 'string', 'description': 'Filter by chunk type (safety_tag, motor_tag, sensor_tag, etc.)'},
-                    'limit': {'type': 'integer', 'description': 'Maximum results to return (default: 20)'}
-                }
-                required = ['query']
-            elif name == 'find_device':
-                properties = {
-                    'device_description': {'type': 'string', 'description': 'Description of device to find'},
-                    'device_type': {'type': 'string', 'description': 'Optional device type filter'}
-                }
-                required = ['device_description']
-            elif name == 'get_module_tags':
-                properties = {
-                    'rack': {'type': 'integer', 'description': 'Rack number'},
-                    'slot': {'type': 'integer', 'description': 'Slot number'}
-                }
-                required = ['rack', 'slot']
-            elif name == 'find_i_o_point':
-                properties = {
-                    'address_pattern': {'type': 'string', 'description': 'I/O address pattern to search for (optional)'},
-                    'description': {'type': 'string', 'description': 'Description to search for (optional)'}
-                }
-                required = []  # At least one parameter required, handled in logic
-            elif name == 'analyze_i_o_usage':
-                properties = {}
-                required = []
-            elif name == 'find_related_tags':
-                properties = {
-                    'tag_name': {'type': 'string', 'description': 'Tag name to find relationships for'},
-                    'relationship_type': {'type': 'string', 'description': 'Type of relationship (all, functional, physical)'}
-                }
-                required = ['tag_name']
-            elif name == 'get_device_overview':
-                properties = {
-                    'category_filter': {'type': 'string', 'description': 'Optional category filter'}
-                }
-                required = []
-            elif name in ['get_safety_tags', 'get_motor_tags', 'get_sensor_tags']:
-                properties = {}
-                required = []
-            
-            tools.append({
-                'name': name,
-                'description': tool['description'],
-                'inputSchema': {
-                    'type': 'object',
-                    'properties': properties,
-                    'required': required
-                }
-            })
-        
-        response["result"] = {'tools': tools}
+        response["result"] = {'tools': server._tools_list_response}
         return response
     
     elif method == 'tools/call':
@@ -1642,11 +1837,16 @@ async def handle_mcp_request(server: Studio5000MCPServer, request: Dict) -> Opti
             handler = server.server.tools[tool_name]['handler']
             try:
                 result = await handler(**arguments)
+                if isinstance(result, dict) and 'body_bytes' in result:
+                    # Handler already serialized its payload (e.g. tag tools with encoded=True)
+                    text = result['body_bytes'].decode('utf-8')
+                else:
+                    text = _encode_json(result, indent=PRETTY_TOOL_RESULTS).decode('utf-8')
                 response["result"] = {
                     'content': [
                         {
                             'type': 'text',
-                            'text': json.dumps(result, indent=2)
+                            'text': text
                         }
                     ]
                 }
@@ -1679,6 +1879,25 @@ async def handle_mcp_request(server: Studio5000MCPServer, request: Dict) -> Opti
         }
         return response
 
+def _encode_json(payload: Any, indent: bool = False) -> bytes:
+    """Encode a payload to JSON bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(payload, option=option)
+    return json.dumps(payload, indent=2 if indent else None).encode('utf-8')
+
+def _decode_json(data: bytes) -> Any:
+    """Decode JSON bytes (orjson when available; its errors subclass json.JSONDecodeError)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _write_message(message: Dict[str, Any]):
+    """Write one JSON-RPC message as a line of UTF-8 on stdout"""
+    stdout = sys.stdout.buffer
+    stdout.write(_encode_json(message) + b'\n')
+    stdout.flush()
+
 async def main():
     """Main server entry point"""
     parser = argparse.ArgumentParser(description='Studio 5000 AI-Powered PLC Programming Assistant MCP Server')
@@ -1698,15 +1917,20 @@ async def main():
     
     args = parser.parse_args()
     
-    # Initialize the server
+    # Create the server; documentation indexing happens in start()
     try:
         mcp_server = Studio5000MCPServer(args.doc_root)
     except Exception as e:
-        import sys
         print(f"Error initializing server: {e}", file=sys.stderr)
         return 1
     
     if args.test:
+        try:
+            await mcp_server.start()
+        except Exception as e:
+            print(f"Error initializing server: {e}", file=sys.stderr)
+            return 1
+        
         # Test mode - run some sample queries
         print("\n=== Testing Studio 5000 MCP Server ===\n")
         
@@ -1772,26 +1996,40 @@ async def main():
     
     else:
         # Real MCP server mode - JSON-RPC 2.0 via stdin/stdout
-        import sys
         print("Studio 5000 MCP Server starting...", file=sys.stderr)
+        
+        # Index in a worker thread while the client handshake is answered; yield once
+        # so the task is running before the loop blocks on stdin
+        startup = asyncio.create_task(mcp_server.start())
+        await asyncio.sleep(0)
         print("Ready to handle MCP requests via stdin/stdout", file=sys.stderr)
         
-        # JSON-RPC 2.0 stdin/stdout protocol handler
+        # JSON-RPC 2.0 stdin/stdout protocol handler; messages are read and written
+        # as UTF-8 bytes on the binary streams, skipping the text IO layer
+        stdin = sys.stdin.buffer
         while True:
             try:
-                line = input()
-                if not line:
+                line = stdin.readline()
+                # Stop at end of input or on a blank line
+                if not line or not line.rstrip(b'\r\n'):
                     break
                 
-                request = json.loads(line)
+                request = _decode_json(line)
+                
+                # Only the initialize handshake can be answered before indexing finishes
+                if not (isinstance(request, dict) and request.get('method') == 'initialize'):
+                    try:
+                        await startup
+                    except Exception as e:
+                        print(f"Error initializing server: {e}", file=sys.stderr)
+                        return 1
+                
                 response = await handle_mcp_request(mcp_server, request)
                 
                 # Only print response if it's not None (notifications return None)
                 if response is not None:
-                    print(json.dumps(response), flush=True)
+                    _write_message(response)
                 
-            except EOFError:
-                break
             except json.JSONDecodeError as e:
                 error_response = {
                     "jsonrpc": "2.0",
@@ -1801,7 +2039,7 @@ async def main():
                         "message": "Parse error"
                     }
                 }
-                print(json.dumps(error_response), flush=True)
+                _write_message(error_response)
             except Exception as e:
                 error_response = {
                     "jsonrpc": "2.0", 
@@ -1811,7 +2049,7 @@ async def main():
                         "message": f"Internal error: {str(e)}"
                     }
                 }
-                print(json.dumps(error_response), flush=True)
+                _write_message(error_response)
 
 if __name__ == "__main__":
     import asyncio
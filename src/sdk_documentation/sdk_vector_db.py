@@ -6,9 +6,11 @@ Creates and manages a vector database for semantic search of SDK documentation,
 methods, classes, enums, and examples.
 """
 
+import heapq
 import json
 import os
 import pickle
+import sys
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
@@ -18,6 +20,15 @@ import logging
 import faiss
 import time
 
+try:
+    from vector_common import (DEFAULT_MODEL_NAME, QUANTIZATION_TYPES, VectorCache, build_index,
+                               embed_incrementally, get_model, search_params)
+except ImportError:
+    # Imported without src/ on sys.path (e.g. run directly); add it as the MCP server does
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from vector_common import (DEFAULT_MODEL_NAME, QUANTIZATION_TYPES, VectorCache, build_index,
+                               embed_incrementally, get_model, search_params)
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,29 +46,39 @@ class SDKSearchResult:
 class SDKVectorDatabase:
     """Vector database for Studio 5000 SDK documentation"""
     
-    def __init__(self, cache_dir: str = "sdk_vector_cache"):
+    def __init__(self, cache_dir: str = "sdk_vector_cache", quantization: str = "fp32"):
+        """
+        Args:
+            cache_dir: Directory for the cached index, embeddings and SDK documentation data
+            quantization: Index storage below the HNSW threshold - 'fp32' (exact,
+                default) or 'int8' (scalar quantized; the full-precision embeddings
+                are kept on disk for incremental rebuilds only)
+        """
+        if quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Unknown quantization '{quantization}', expected one of {sorted(QUANTIZATION_TYPES)}")
+        
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.quantization = quantization
         
         # Initialize sentence transformer for embeddings
+        self.model_name = DEFAULT_MODEL_NAME
         self.model = None
         self.index = None
         self.operations_data = []
         self.embeddings = None
+        self._embedding_keys: List[str] = []  # Content hash of each embeddings row
         
-        # Cache file paths
-        self.index_cache = self.cache_dir / "sdk_index.faiss"
-        self.embeddings_cache = self.cache_dir / "sdk_embeddings.pkl"
-        self.data_cache = self.cache_dir / "sdk_operations.pkl"
+        # Cache files, switched between generations by a manifest
+        self.vector_cache = VectorCache(self.cache_dir, "sdk")
         
     def initialize_model(self):
         """Initialize the sentence transformer model"""
         if self.model is None:
             logger.info("Loading sentence transformer model...")
             try:
-                # Use a model optimized for semantic search
-                from sentence_transformers import SentenceTransformer
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
+                # Use a model optimized for semantic search, shared with the instruction database
+                self.model = get_model(self.model_name)
                 logger.info("Model loaded successfully")
             except Exception as e:
                 logger.error(f"Failed to load sentence transformer: {e}")
@@ -70,8 +91,9 @@ class SDKVectorDatabase:
         # Check if cached version exists and is recent
         if not force_rebuild and self._cache_exists() and self._cache_is_recent():
             logger.info("Loading cached vector database...")
-            self._load_from_cache()
-            return
+            if self._load_from_cache():
+                return
+            logger.warning("Cached vector database is incomplete, rebuilding")
         
         logger.info(f"Building vector database for {len(sdk_operations)} SDK operations...")
         
@@ -91,24 +113,36 @@ class SDKVectorDatabase:
             texts_to_embed.append(text)
         
         logger.info("Creating embeddings...")
-        start_time = time.time()
-        self.embeddings = self.model.encode(texts_to_embed, show_progress_bar=True)
-        embedding_time = time.time() - start_time
+        start_time = time.perf_counter()
+        self.embeddings, self._embedding_keys = self._embed_incrementally(texts_to_embed)
+        embedding_time = time.perf_counter() - start_time
         logger.info(f"Created {len(self.embeddings)} embeddings in {embedding_time:.2f} seconds")
         
         # Build FAISS index for fast similarity search
         logger.info("Building FAISS index...")
-        dimension = self.embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(dimension)  # Inner product for cosine similarity
-        
-        # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(self.embeddings)
-        self.index.add(self.embeddings.astype(np.float32))
+        self.index = build_index(self.embeddings, self.quantization)
         
         # Save to cache
         self._save_to_cache()
+        
+        # int8 codes live in the index; the embeddings are only needed on disk
+        if self.quantization == 'int8':
+            self.embeddings = None
+            self._embedding_keys = []
         logger.info("Vector database built and cached successfully")
     
+    def _embed_incrementally(self, texts: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Embed texts, reusing previous rows for texts whose content hash is unchanged"""
+        previous_embeddings, previous_keys = self._previous_embeddings()
+        return embed_incrementally(self.model, texts, previous_embeddings, previous_keys)
+    
+    def _previous_embeddings(self) -> Tuple[Optional[np.ndarray], List[str]]:
+        """Embeddings and content keys from the last build, in memory or on disk"""
+        
+        if self.embeddings is not None and len(self._embedding_keys) == len(self.embeddings):
+            return self.embeddings, self._embedding_keys
+        return self.vector_cache.previous_embeddings(self.model_name)
+    
     def _create_embedding_text(self, operation: Dict[str, Any]) -> str:
         """Create comprehensive text for embedding an operation"""
         op_type = operation.get('type', '')
@@ -184,39 +218,53 @@ class SDKVectorDatabase:
     
     def search_sdk_operations(self, query: str, limit: int = 20, score_threshold: float = 0.3) -> List[SDKSearchResult]:
         """Search SDK operations using vector similarity"""
+        return self.search_sdk_operations_batch([query], limit, score_threshold)[0]
+    
+    def search_sdk_operations_batch(self, queries: List[str], limit: int = 20,
+                                    score_threshold: float = 0.3) -> List[List[SDKSearchResult]]:
+        """Search SDK operations for several queries with one model forward pass and one index search"""
+        if not queries:
+            return []
+        
         if not self.operations_data:
             logger.warning("No SDK operations data available")
-            return []
+            return [[] for _ in queries]
         
         if self.model is None or self.index is None:
             # Fallback to text-based search
-            return self._text_based_search(query, limit)
+            return [self._text_based_search(query, limit) for query in queries]
         
-        # Create embedding for query
-        query_embedding = self.model.encode([query])
-        faiss.normalize_L2(query_embedding)
+        # Create embeddings for all queries at once
+        query_embeddings = self.model.encode(list(queries))
+        faiss.normalize_L2(query_embeddings)
         
         # Search using FAISS
-        scores, indices = self.index.search(query_embedding.astype(np.float32), min(limit * 2, len(self.operations_data)))
+        k = min(limit * 2, len(self.operations_data))
+        scores, indices = self.index.search(query_embeddings.astype(np.float32), k,
+                                            params=search_params(self.index, k))
         
-        # Convert to results
-        results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if score >= score_threshold:
-                operation = self.operations_data[idx]
-                result = SDKSearchResult(
-                    name=operation.get('name', operation.get('title', '')),
-                    type=operation.get('type', ''),
-                    description=operation.get('description', ''),
-                    category=operation.get('category', ''),
-                    score=float(score),
-                    details=operation
-                )
-                results.append(result)
+        batch_results = []
+        for row_scores, row_indices in zip(scores, indices):
+            # Convert to results
+            results = []
+            for score, idx in zip(row_scores, row_indices):
+                if score >= score_threshold and idx >= 0:
+                    operation = self.operations_data[idx]
+                    result = SDKSearchResult(
+                        name=operation.get('name', operation.get('title', '')),
+                        type=operation.get('type', ''),
+                        description=operation.get('description', ''),
+                        category=operation.get('category', ''),
+                        score=float(score),
+                        details=operation
+                    )
+                    results.append(result)
+            
+            # Sort by score and return top results
+            results.sort(key=lambda x: x.score, reverse=True)
+            batch_results.append(results[:limit])
         
-        # Sort by score and return top results
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:limit]
+        return batch_results
     
     def _text_based_search(self, query: str, limit: int) -> List[SDKSearchResult]:
         """Fallback text-based search when vector search is not available"""
@@ -255,9 +303,8 @@ class SDKVectorDatabase:
                     )
                     results.append(result)
         
-        # Sort by score and return top results
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:limit]
+        # Select the top results by score
+        return heapq.nlargest(limit, results, key=lambda x: x.score)
     
     def get_operation_by_name(self, name: str, op_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get a specific operation by name"""
@@ -291,7 +338,8 @@ class SDKVectorDatabase:
             'total_operations': len(self.operations_data),
             'by_type': {},
             'by_category': {},
-            'has_vector_search': self.model is not None and self.index is not None
+            'has_vector_search': self.model is not None and self.index is not None,
+            'quantization': self.quantization
         }
         
         for operation in self.operations_data:
@@ -305,62 +353,42 @@ class SDKVectorDatabase:
     
     def _cache_exists(self) -> bool:
         """Check if cache files exist"""
-        return (self.data_cache.exists() and 
-                (not self.model or (self.index_cache.exists() and self.embeddings_cache.exists())))
+        return self.vector_cache.read_manifest() is not None
     
     def _cache_is_recent(self, max_age_hours: int = 24) -> bool:
         """Check if cache is recent enough"""
-        try:
-            cache_time = self.data_cache.stat().st_mtime
-            age_hours = (time.time() - cache_time) / 3600
-            return age_hours < max_age_hours
-        except:
-            return False
+        cache_age = self.vector_cache.age_seconds()
+        return cache_age is not None and cache_age / 3600 < max_age_hours
     
     def _save_to_cache(self):
         """Save vector database to cache files"""
         try:
-            # Save operations data
-            with open(self.data_cache, 'wb') as f:
-                pickle.dump(self.operations_data, f)
-            
-            if self.model is not None:
-                # Save FAISS index
-                if self.index is not None:
-                    faiss.write_index(self.index, str(self.index_cache))
-                
-                # Save embeddings
-                if self.embeddings is not None:
-                    with open(self.embeddings_cache, 'wb') as f:
-                        pickle.dump(self.embeddings, f)
-            
+            self.vector_cache.save(self.operations_data, self.index, self.embeddings,
+                                   self._embedding_keys, self.model_name, self.quantization)
             logger.info("Vector database cached successfully")
         except Exception as e:
             logger.error(f"Failed to save cache: {e}")
     
-    def _load_from_cache(self):
-        """Load vector database from cache files"""
-        try:
-            # Load operations data
-            with open(self.data_cache, 'rb') as f:
-                self.operations_data = pickle.load(f)
-            
-            # Initialize model if we have vector cache
-            if self.index_cache.exists() and self.embeddings_cache.exists():
-                self.initialize_model()
-                
-                if self.model is not None:
-                    # Load FAISS index
-                    self.index = faiss.read_index(str(self.index_cache))
-                    
-                    # Load embeddings
-                    with open(self.embeddings_cache, 'rb') as f:
-                        self.embeddings = pickle.load(f)
+    def _load_from_cache(self) -> bool:
+        """Load vector database from cache files; False if the cache must be rebuilt"""
+        # Embeddings are memory-mapped; int8 indexes only need them for rebuilds
+        cached = self.vector_cache.load(load_embeddings=self.quantization != 'int8')
+        if cached is None or (cached.index is not None and cached.quantization != self.quantization):
+            return False
+        
+        self.operations_data = cached.records
+        
+        # Initialize model if we have vector cache
+        if cached.index is not None:
+            self.initialize_model()
             
-            logger.info(f"Loaded {len(self.operations_data)} operations from cache")
-        except Exception as e:
-            logger.error(f"Failed to load cache: {e}")
-            raise
+            if self.model is not None:
+                self.index = cached.index
+                self.embeddings = cached.embeddings
+                self._embedding_keys = cached.embedding_keys
+        
+        logger.info(f"Loaded {len(self.operations_data)} operations from cache")
+        return True
 
 
 def main():
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tag Result Serialization
+
+Converts TagSearchResult lists into the JSON-ready dicts returned by the tag MCP tools.
+The module is fully typed and free of dynamic features so it can be compiled ahead of
+time with mypyc (``mypyc src/tag_analyzer/_serialize.py``); a compiled extension is
+picked up in place of this file automatically.
+"""
+
+from typing import Any, Dict, List
+
+from .tag_vector_db import TagSearchResult
+
+def serialize_search_hit(result: TagSearchResult) -> Dict[str, Any]:
+    """Convert a tag search result to its search_tags response form"""
+    return {
+        'tag_name': result.tag_name,
+        'type': result.chunk_type.value,
+        'description': result.description,
+        'function': result.function,
+        'category': result.category,
+        'score': result.score,
+        'device_info': result.json_device_info,
+        'i_o_address': result.i_o_address,
+        'related_tags': result.top_related,  # Limited for JSON size
+        'metadata': result.json_metadata
+    }
+
+def build_search_hits(results: List[TagSearchResult]) -> List[Dict[str, Any]]:
+    """Serialize results for search_tags"""
+    return [serialize_search_hit(result) for result in results]
+
+def build_device_hits(results: List[TagSearchResult]) -> List[Dict[str, Any]]:
+    """Serialize results for find_device"""
+    devices: List[Dict[str, Any]] = []
+    for result in results:
+        device_info = result.device_info
+        devices.append({
+            'tag_name': result.tag_name,
+            'description': result.description,
+            'function': result.function,
+            'score': result.score,
+            'location': {
+                'rack': device_info.rack,
+                'slot': device_info.slot,
+                'module_type': device_info.module_type
+            },
+            'i_o_address': result.i_o_address,
+            'related_tags': result.top_related[:3]
+        })
+    return devices
+
+def build_module_tags(results: List[TagSearchResult]) -> List[Dict[str, Any]]:
+    """Serialize results for get_module_tags"""
+    return [
+        {
+            'tag_name': result.tag_name,
+            'description': result.description,
+            'function': result.function,
+            'category': result.category,
+            'i_o_address': result.i_o_address,
+            'connection_type': result.device_info.connection_type
+        }
+        for result in results
+    ]
+
+def build_i_o_points(results: List[TagSearchResult]) -> List[Dict[str, Any]]:
+    """Serialize results for find_i_o_point"""
+    i_o_points: List[Dict[str, Any]] = []
+    for result in results:
+        device_info = result.device_info
+        i_o_points.append({
+            'tag_name': result.tag_name,
+            'description': result.description,
+            'function': result.function,
+            'i_o_address': result.i_o_address,
+            'location': {
+                'rack': device_info.rack,
+                'slot': device_info.slot,
+                'channel': device_info.channel
+            },
+            'device_info': {
+                'module_type': device_info.module_type,
+                'device_category': device_info.device_category,
+                'connection_type': device_info.connection_type
+            }
+        })
+    return i_o_points
+
+def build_related_tags(results: List[TagSearchResult]) -> List[Dict[str, Any]]:
+    """Serialize results for find_related_tags"""
+    related_tags: List[Dict[str, Any]] = []
+    for result in results:
+        device_info = result.device_info
+        related_tags.append({
+            'tag_name': result.tag_name,
+            'description': result.description,
+            'function': result.function,
+            'relationship_score': result.score,
+            'location': {
+                'rack': device_info.rack,
+                'slot': device_info.slot
+            },
+            'device_category': device_info.device_category
+        })
+    return related_tags
@@ -181,6 +181,7 @@ class CSVTagParser:
         for chunk in self.tag_chunks:
             related_tags = find_related_tags(self.tag_chunks, chunk)
             chunk.related_tags = related_tags
+            chunk.invalidate_json_cache()
             
             # Also enhance description with comment data if available
             if chunk.tag_name in self.comment_map:
@@ -216,6 +217,7 @@ class CSVTagParser:
             # Re-run function detection with the enhanced description
             from .tag_chunk import detect_function_from_description
             chunk.function = detect_function_from_description(enhanced_desc, chunk.tag_name)
+            chunk.invalidate_json_cache()
     
     def _log_statistics(self):
         """Log parsing statistics"""
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+ONNX Runtime Sentence Encoder
+
+CPU-oriented replacement for the SentenceTransformer encoder used by the tag vector
+database. The all-MiniLM-L6-v2 model is exported to ONNX once, dynamically quantized
+to INT8 and cached on disk; encoding then runs through onnxruntime with mean pooling
+and L2 normalization, matching SentenceTransformer's output for this model.
+"""
+
+import logging
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_ID = 'sentence-transformers/all-MiniLM-L6-v2'
+MAX_SEQ_LENGTH = 256
+
+class OnnxSentenceEncoder:
+    """INT8 ONNX Runtime encoder exposing the SentenceTransformer encode() interface"""
+
+    def __init__(self, onnx_dir: Path, model_id: str = DEFAULT_MODEL_ID):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.onnx_dir = Path(onnx_dir)
+        quantized_path = self.onnx_dir / "model_int8.onnx"
+        if not quantized_path.exists():
+            self._export_quantized(model_id, quantized_path)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.onnx_dir))
+        self.session = ort.InferenceSession(str(quantized_path), providers=['CPUExecutionProvider'])
+        self._input_names = {node.name for node in self.session.get_inputs()}
+
+    def _export_quantized(self, model_id: str, quantized_path: Path):
+        """Export the model to ONNX and quantize its weights to INT8"""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        from transformers import AutoTokenizer
+
+        logger.info(f"Exporting {model_id} to ONNX in {self.onnx_dir}...")
+        self.onnx_dir.mkdir(parents=True, exist_ok=True)
+        ORTModelForFeatureExtraction.from_pretrained(model_id, export=True).save_pretrained(str(self.onnx_dir))
+        AutoTokenizer.from_pretrained(model_id).save_pretrained(str(self.onnx_dir))
+
+        logger.info("Quantizing ONNX model to INT8...")
+        quantize_dynamic(str(self.onnx_dir / "model.onnx"), str(quantized_path),
+                         weight_type=QuantType.QInt8)
+
+    def encode(self, sentences: List[str], batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        """Embed sentences as L2-normalized mean-pooled vectors"""
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            batch = sentences[start:start + batch_size]
+            inputs = self.tokenizer(batch, padding=True, truncation=True,
+                                    max_length=MAX_SEQ_LENGTH, return_tensors='np')
+            feeds = {name: value.astype(np.int64) for name, value in inputs.items()
+                     if name in self._input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over non-padding tokens
+            mask = inputs['attention_mask'][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+
+        if not batches:
+            hidden_size = self.session.get_outputs()[0].shape[-1]
+            return np.zeros((0, hidden_size if isinstance(hidden_size, int) else 0), dtype=np.float32)
+        return np.concatenate(batches)
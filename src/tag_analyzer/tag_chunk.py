@@ -7,8 +7,8 @@ including I/O mappings, device information, and physical addressing.
 """
 
 import re
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 
 class TagChunkType(Enum):
@@ -35,6 +35,24 @@ class DeviceInfo:
     local_address: str = ""         # Local:x:I.Data.x format
     device_category: str = ""       # VFD, DI, DO, AI, AO, Safety
     connection_type: str = ""       # Input, Output, Safety Input, Safety Output
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize device information for JSON responses"""
+        return {
+            'module_type': self.module_type,
+            'rack': self.rack,
+            'slot': self.slot,
+            'channel': self.channel,
+            'local_address': self.local_address,
+            'device_category': self.device_category,
+            'connection_type': self.connection_type
+        }
+
+# Number of related tags included in search responses
+TOP_RELATED_COUNT = 5
+
+# Metadata value types that can be passed straight through to JSON responses
+SERIALIZABLE_METADATA_TYPES = (str, int, float, bool)
 
 @dataclass
 class TagChunk:
@@ -65,6 +83,11 @@ class TagChunk:
     # Additional metadata
     metadata: Dict[str, Any] = None # Additional CSV columns and context
     
+    # Cached serialization views (filled on first use, not part of identity)
+    _json_metadata: Dict[str, Any] = field(default=None, repr=False, compare=False)
+    _json_device_info: Dict[str, Any] = field(default=None, repr=False, compare=False)
+    _top_related: Tuple[str, ...] = field(default=None, repr=False, compare=False)
+    
     def __post_init__(self):
         if self.related_tags is None:
             self.related_tags = []
@@ -120,6 +143,34 @@ class TagChunk:
         
         return " | ".join(parts)
     
+    @property
+    def json_metadata(self) -> Dict[str, Any]:
+        """JSON-safe subset of metadata, computed once per chunk"""
+        if self._json_metadata is None:
+            self._json_metadata = {k: v for k, v in self.metadata.items()
+                                   if isinstance(v, SERIALIZABLE_METADATA_TYPES)}
+        return self._json_metadata
+    
+    @property
+    def json_device_info(self) -> Dict[str, Any]:
+        """Serialized device information, computed once per chunk"""
+        if self._json_device_info is None:
+            self._json_device_info = self.device_info.to_dict()
+        return self._json_device_info
+    
+    @property
+    def top_related(self) -> Tuple[str, ...]:
+        """First TOP_RELATED_COUNT related tags, computed once per chunk"""
+        if self._top_related is None:
+            self._top_related = tuple(self.related_tags[:TOP_RELATED_COUNT])
+        return self._top_related
+    
+    def invalidate_json_cache(self):
+        """Drop cached serialization views after metadata, device info or relationships change"""
+        self._json_metadata = None
+        self._json_device_info = None
+        self._top_related = None
+    
     @property
     def is_safety_tag(self) -> bool:
         """Check if this is a safety-related tag"""
@@ -7,18 +7,63 @@ and analysis of Studio 5000 tag CSV exports.
 """
 
 import asyncio
+import functools
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Any
 from pathlib import Path
 from enum import Enum
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .tag_vector_db import TagVectorDatabase, TagSearchResult
 from .csv_tag_parser import CSVTagParser
 from .tag_chunk import TagChunk, TagChunkType
+from ._serialize import (
+    serialize_search_hit, build_search_hits, build_device_hits,
+    build_module_tags, build_i_o_points, build_related_tags
+)
 
 logger = logging.getLogger(__name__)
 
+def _encode_response(payload: Dict[str, Any]) -> bytes:
+    """Encode a response payload to JSON bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload).encode('utf-8')
+
+def _maybe_encode(payload: Dict[str, Any], encoded: bool) -> Dict[str, Any]:
+    """Return the payload as-is, or pre-serialized under 'body_bytes' when encoded is set"""
+    if not encoded:
+        return payload
+    return {
+        'success': payload.get('success', True),
+        'body_bytes': _encode_response(payload)
+    }
+
+# Chunk type lookup by value, avoids exception-driven TagChunkType(...) validation
+_CHUNK_TYPE_MAP = {chunk_type.value: chunk_type for chunk_type in TagChunkType}
+
+# Worker threads for vector database calls (FAISS/NumPy release the GIL)
+SEARCH_WORKERS = 4
+
+# Maximum number of indexed files remembered in indexing status
+MAX_INDEXED_FILES = 64
+
+# Canned searches served by get_tag_bundles: name -> (query, chunk type filter)
+TAG_BUNDLES = {
+    'safety': ("safety emergency estop", "safety_tag"),
+    'motor': ("motor drive vfd conveyor", "motor_tag"),
+    'sensor': ("sensor photoeye proximity switch", "sensor_tag")
+}
+
 class TagMCPTools(Enum):
     """Enumeration of available tag analysis MCP tools"""
     INDEX_TAG_CSV = "index_tag_csv"
@@ -33,6 +78,12 @@ class TagMCPTools(Enum):
     GET_MOTOR_TAGS = "get_motor_tags"
     GET_SENSOR_TAGS = "get_sensor_tags"
 
+# Tool descriptions are static, so build them once
+_AVAILABLE_TOOLS = {
+    tool.value: f"Tag analysis tool: {tool.value.replace('_', ' ').title()}"
+    for tool in TagMCPTools
+}
+
 class TagMCPIntegration:
     """
     MCP integration for tag analysis tools enabling semantic search
@@ -44,8 +95,12 @@ class TagMCPIntegration:
         self.parser = CSVTagParser()
         self.initialized = False
         
-        # Index status
-        self.indexed_files = {}
+        # Index status (LRU, most recently indexed file last)
+        self.indexed_files = OrderedDict()
+        
+        # Vector database queries run here so they don't block the event loop
+        self._pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS,
+                                        thread_name_prefix="tag-search")
     
     async def initialize(self, force_rebuild: bool = False):
         """Initialize the tag analysis system"""
@@ -66,6 +121,11 @@ class TagMCPIntegration:
             logger.error(f"Failed to initialize tag MCP integration: {e}")
             raise
     
+    async def _run_in_pool(self, func, *args, **kwargs):
+        """Run a blocking vector database call on the search thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(func, *args, **kwargs))
+    
     async def index_tag_csv(self, csv_path: str, force_rebuild: bool = False) -> Dict[str, Any]:
         """
         Index Studio 5000 tag CSV export for semantic search
@@ -86,6 +146,22 @@ class TagMCPIntegration:
                     'error': f'CSV file not found: {csv_path}'
                 }
             
+            file_name = Path(csv_path).name
+            mtime = Path(csv_path).stat().st_mtime
+            
+            # Skip re-indexing when the file currently loaded is unchanged on disk
+            cached = self.indexed_files.get(file_name)
+            if (cached and not force_rebuild and
+                    next(reversed(self.indexed_files)) == file_name and
+                    cached['path'] == csv_path and cached['mtime'] == mtime):
+                return {
+                    'success': True,
+                    'file_name': file_name,
+                    'tags_indexed': cached['tag_count'],
+                    'statistics': cached['statistics'],
+                    'message': f'{file_name} is already indexed and unchanged ({cached["tag_count"]} tags)'
+                }
+            
             # Parse the CSV file
             tag_chunks = self.parser.parse_tag_csv(csv_path)
             
@@ -100,15 +176,18 @@ class TagMCPIntegration:
             
             # Get statistics
             stats = self.parser.get_statistics()
-            file_name = Path(csv_path).name
             
             # Update indexed files status
+            self.indexed_files.pop(file_name, None)
             self.indexed_files[file_name] = {
                 'path': csv_path,
-                'indexed_at': asyncio.get_event_loop().time(),
+                'mtime': mtime,
+                'indexed_at': time.time(),  # Wall clock; reported to clients by get_indexing_status
                 'tag_count': len(tag_chunks),
                 'statistics': stats
             }
+            while len(self.indexed_files) > MAX_INDEXED_FILES:
+                self.indexed_files.popitem(last=False)
             
             return {
                 'success': True,
@@ -126,7 +205,8 @@ class TagMCPIntegration:
             }
     
     async def search_tags(self, query: str, category_filter: str = None,
-                         chunk_type_filter: str = None, limit: int = 20) -> Dict[str, Any]:
+                         chunk_type_filter: str = None, limit: int = 20,
+                         encoded: bool = False) -> Dict[str, Any]:
         """
         Semantic search within tag database
         
@@ -135,64 +215,27 @@ class TagMCPIntegration:
             category_filter: Filter by device category (VFD, Safety, DI, DO, etc.)
             chunk_type_filter: Filter by chunk type
             limit: Maximum results to return
+            encoded: Return the payload pre-serialized as JSON bytes under 'body_bytes'
             
         Returns:
             Dictionary with search results
         """
         try:
             # Convert chunk_type_filter string to enum if provided
-            chunk_type_enum = None
-            if chunk_type_filter:
-                try:
-                    chunk_type_enum = TagChunkType(chunk_type_filter.lower())
-                except ValueError:
-                    return {
-                        'success': False,
-                        'error': f'Invalid chunk type: {chunk_type_filter}'
-                    }
+            chunk_type_enum = _CHUNK_TYPE_MAP.get(chunk_type_filter.lower()) if chunk_type_filter else None
+            if chunk_type_filter and chunk_type_enum is None:
+                return {
+                    'success': False,
+                    'error': f'Invalid chunk type: {chunk_type_filter}'
+                }
             
             # Perform search
-            results = self.vector_db.search_tags(
-                query, limit, 
-                category_filter=category_filter,
-                chunk_type_filter=chunk_type_enum
-            )
+            search_results = [
+                hit async for hit in self._stream_hits(query, category_filter, chunk_type_enum, limit)
+            ]
             
-            # Convert results to serializable format
-            search_results = []
-            for result in results:
-                search_results.append({
-                    'tag_name': result.tag_name,
-                    'type': result.chunk_type.value,
-                    'description': result.description,
-                    'function': result.function,
-                    'category': result.category,
-                    'score': result.score,
-                    'device_info': {
-                        'module_type': result.device_info.module_type,
-                        'rack': result.device_info.rack,
-                        'slot': result.device_info.slot,
-                        'channel': result.device_info.channel,
-                        'local_address': result.device_info.local_address,
-                        'device_category': result.device_info.device_category,
-                        'connection_type': result.device_info.connection_type
-                    },
-                    'i_o_address': result.i_o_address,
-                    'related_tags': result.related_tags[:5],  # Limit for JSON size
-                    'metadata': {k: v for k, v in result.metadata.items() 
-                               if isinstance(v, (str, int, float, bool))}
-                })
-            
-            return {
-                'success': True,
-                'query': query,
-                'results_count': len(search_results),
-                'results': search_results,
-                'filters_applied': {
-                    'category': category_filter,
-                    'chunk_type': chunk_type_filter
-                }
-            }
+            response = self._format_search_response(query, search_results, category_filter, chunk_type_filter)
+            return _maybe_encode(response, encoded)
             
         except Exception as e:
             logger.error(f"Error searching tags: {e}")
@@ -201,37 +244,79 @@ class TagMCPIntegration:
                 'error': f'Search failed: {str(e)}'
             }
     
-    async def find_device(self, device_description: str, device_type: str = None) -> Dict[str, Any]:
+    async def stream_search_tags(self, query: str, category_filter: str = None,
+                                 chunk_type_filter: str = None, limit: int = 20) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Semantic search within tag database, yielding serialized hits one at a time
+        
+        Args:
+            query: Search query
+            category_filter: Filter by device category (VFD, Safety, DI, DO, etc.)
+            chunk_type_filter: Filter by chunk type
+            limit: Maximum results to return
+            
+        Yields:
+            Serialized search hits in rank order
+            
+        Raises:
+            ValueError: If chunk_type_filter is not a known chunk type
+        """
+        chunk_type_enum = _CHUNK_TYPE_MAP.get(chunk_type_filter.lower()) if chunk_type_filter else None
+        if chunk_type_filter and chunk_type_enum is None:
+            raise ValueError(f'Invalid chunk type: {chunk_type_filter}')
+        
+        async for hit in self._stream_hits(query, category_filter, chunk_type_enum, limit):
+            yield hit
+    
+    async def _stream_hits(self, query: str, category_filter: Optional[str],
+                           chunk_type_enum: Optional[TagChunkType], limit: int) -> AsyncIterator[Dict[str, Any]]:
+        """Run a tag search on the pool and serialize hits lazily"""
+        results = await self._run_in_pool(
+            self.vector_db.search_tags,
+            query, limit, 
+            category_filter=category_filter,
+            chunk_type_filter=chunk_type_enum
+        )
+        
+        for result in results:
+            yield serialize_search_hit(result)
+    
+    def _format_search_response(self, query: str, search_results: List[Dict[str, Any]],
+                                category_filter: str = None, chunk_type_filter: str = None) -> Dict[str, Any]:
+        """Build the search_tags response payload from serialized hits"""
+        
+        return {
+            'success': True,
+            'query': query,
+            'results_count': len(search_results),
+            'results': search_results,
+            'filters_applied': {
+                'category': category_filter,
+                'chunk_type': chunk_type_filter
+            }
+        }
+    
+    async def find_device(self, device_description: str, device_type: str = None,
+                          encoded: bool = False) -> Dict[str, Any]:
         """
         Find specific devices by description or function
         
         Args:
             device_description: Description of device to find
             device_type: Optional device type filter
+            encoded: Return the payload pre-serialized as JSON bytes under 'body_bytes'
             
         Returns:
             Dictionary with matching devices
         """
         try:
-            results = self.vector_db.find_device_by_description(device_description, device_type)
-            
-            devices = []
-            for result in results:
-                devices.append({
-                    'tag_name': result.tag_name,
-                    'description': result.description,
-                    'function': result.function,
-                    'score': result.score,
-                    'location': {
-                        'rack': result.device_info.rack,
-                        'slot': result.device_info.slot,
-                        'module_type': result.device_info.module_type
-                    },
-                    'i_o_address': result.i_o_address,
-                    'related_tags': result.related_tags[:3]
-                })
+            results = await self._run_in_pool(
+                self.vector_db.find_device_by_description, device_description, device_type
+            )
             
-            return {
+            devices = build_device_hits(results)
+            
+            response = {
                 'success': True,
                 'device_description': device_description,
                 'device_type': device_type,
@@ -239,6 +324,8 @@ class TagMCPIntegration:
                 'devices': devices
             }
             
+            return _maybe_encode(response, encoded)
+            
         except Exception as e:
             logger.error(f"Error finding device: {e}")
             return {
@@ -246,50 +333,42 @@ class TagMCPIntegration:
                 'error': f'Device search failed: {str(e)}'
             }
     
-    async def get_module_tags(self, rack: int, slot: int) -> Dict[str, Any]:
+    async def get_module_tags(self, rack: int, slot: int, encoded: bool = False) -> Dict[str, Any]:
         """
         Get all tags for a specific module (rack/slot)
         
         Args:
             rack: Rack number
             slot: Slot number
+            encoded: Return the payload pre-serialized as JSON bytes under 'body_bytes'
             
         Returns:
             Dictionary with module tags
         """
         try:
-            results = self.vector_db.get_tags_by_module(rack, slot)
+            results = await self._run_in_pool(self.vector_db.get_tags_by_module, rack, slot)
             
-            module_tags = []
-            module_info = None
+            module_tags = build_module_tags(results)
             
-            for result in results:
-                tag_info = {
-                    'tag_name': result.tag_name,
-                    'description': result.description,
-                    'function': result.function,
-                    'category': result.category,
-                    'i_o_address': result.i_o_address,
-                    'connection_type': result.device_info.connection_type
+            # Capture module info from first result
+            module_info = None
+            if results:
+                module_info = {
+                    'rack': rack,
+                    'slot': slot,
+                    'module_type': results[0].device_info.module_type,
+                    'device_category': results[0].device_info.device_category
                 }
-                module_tags.append(tag_info)
-                
-                # Capture module info from first result
-                if module_info is None:
-                    module_info = {
-                        'rack': rack,
-                        'slot': slot,
-                        'module_type': result.device_info.module_type,
-                        'device_category': result.device_info.device_category
-                    }
             
-            return {
+            response = {
                 'success': True,
                 'module_info': module_info,
                 'tag_count': len(module_tags),
                 'tags': module_tags
             }
             
+            return _maybe_encode(response, encoded)
+            
         except Exception as e:
             logger.error(f"Error getting module tags: {e}")
             return {
@@ -297,40 +376,25 @@ class TagMCPIntegration:
                 'error': f'Module query failed: {str(e)}'
             }
     
-    async def find_i_o_point(self, address_pattern: str = None, description: str = None) -> Dict[str, Any]:
+    async def find_i_o_point(self, address_pattern: str = None, description: str = None,
+                             encoded: bool = False) -> Dict[str, Any]:
         """
         Find specific I/O points by address or description
         
         Args:
             address_pattern: I/O address pattern to search for
             description: Description to search for
+            encoded: Return the payload pre-serialized as JSON bytes under 'body_bytes'
             
         Returns:
             Dictionary with matching I/O points
         """
         try:
-            results = self.vector_db.find_i_o_point(address_pattern, description)
-            
-            i_o_points = []
-            for result in results:
-                i_o_points.append({
-                    'tag_name': result.tag_name,
-                    'description': result.description,
-                    'function': result.function,
-                    'i_o_address': result.i_o_address,
-                    'location': {
-                        'rack': result.device_info.rack,
-                        'slot': result.device_info.slot,
-                        'channel': result.device_info.channel
-                    },
-                    'device_info': {
-                        'module_type': result.device_info.module_type,
-                        'device_category': result.device_info.device_category,
-                        'connection_type': result.device_info.connection_type
-                    }
-                })
+            results = await self._run_in_pool(self.vector_db.find_i_o_point, address_pattern, description)
             
-            return {
+            i_o_points = build_i_o_points(results)
+            
+            response = {
                 'success': True,
                 'search_criteria': {
                     'address_pattern': address_pattern,
@@ -340,6 +404,8 @@ class TagMCPIntegration:
                 'i_o_points': i_o_points
             }
             
+            return _maybe_encode(response, encoded)
+            
         except Exception as e:
             logger.error(f"Error finding I/O point: {e}")
             return {
@@ -355,7 +421,7 @@ class TagMCPIntegration:
             Dictionary with I/O usage analysis
         """
         try:
-            analysis = self.vector_db.analyze_i_o_usage()
+            analysis = await self._run_in_pool(self.vector_db.analyze_i_o_usage)
             
             return {
                 'success': True,
@@ -377,35 +443,25 @@ class TagMCPIntegration:
                 'error': f'I/O analysis failed: {str(e)}'
             }
     
-    async def find_related_tags(self, tag_name: str, relationship_type: str = "all") -> Dict[str, Any]:
+    async def find_related_tags(self, tag_name: str, relationship_type: str = "all",
+                                encoded: bool = False) -> Dict[str, Any]:
         """
         Find tags related to a given tag
         
         Args:
             tag_name: Tag name to find relationships for
             relationship_type: Type of relationship ('all', 'functional', 'physical')
+            encoded: Return the payload pre-serialized as JSON bytes under 'body_bytes'
             
         Returns:
             Dictionary with related tags
         """
         try:
-            results = self.vector_db.find_related_tags(tag_name, relationship_type)
-            
-            related_tags = []
-            for result in results:
-                related_tags.append({
-                    'tag_name': result.tag_name,
-                    'description': result.description,
-                    'function': result.function,
-                    'relationship_score': result.score,
-                    'location': {
-                        'rack': result.device_info.rack,
-                        'slot': result.device_info.slot
-                    },
-                    'device_category': result.device_info.device_category
-                })
+            results = await self._run_in_pool(self.vector_db.find_related_tags, tag_name, relationship_type)
             
-            return {
+            related_tags = build_related_tags(results)
+            
+            response = {
                 'success': True,
                 'source_tag': tag_name,
                 'relationship_type': relationship_type,
@@ -413,6 +469,8 @@ class TagMCPIntegration:
                 'related_tags': related_tags
             }
             
+            return _maybe_encode(response, encoded)
+            
         except Exception as e:
             logger.error(f"Error finding related tags: {e}")
             return {
@@ -431,7 +489,7 @@ class TagMCPIntegration:
             Dictionary with device overview
         """
         try:
-            overview = self.vector_db.get_device_overview(category_filter)
+            overview = await self._run_in_pool(self.vector_db.get_device_overview, category_filter)
             
             return {
                 'success': True,
@@ -446,24 +504,61 @@ class TagMCPIntegration:
                 'error': f'Device overview failed: {str(e)}'
             }
     
+    async def get_tag_bundles(self, bundle_names: List[str] = None, limit: int = 50) -> Dict[str, Dict[str, Any]]:
+        """
+        Run several canned tag searches (safety, motor, sensor) in one batched query
+        
+        Args:
+            bundle_names: Bundles to fetch (defaults to all of TAG_BUNDLES)
+            limit: Maximum results per bundle
+            
+        Returns:
+            Dictionary mapping bundle name to a search_tags style response
+        """
+        bundle_names = list(bundle_names or TAG_BUNDLES)
+        
+        try:
+            queries = [TAG_BUNDLES[name][0] for name in bundle_names]
+            chunk_types = [TAG_BUNDLES[name][1] for name in bundle_names]
+            
+            batched_results = await self._run_in_pool(
+                self.vector_db.search_tags_batch,
+                queries, limit,
+                chunk_type_filters=[_CHUNK_TYPE_MAP[chunk_type] for chunk_type in chunk_types]
+            )
+            
+            return {
+                name: self._format_search_response(
+                    query, build_search_hits(results), None, chunk_type
+                )
+                for name, query, chunk_type, results in zip(bundle_names, queries, chunk_types, batched_results)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting tag bundles: {e}")
+            return {
+                name: {
+                    'success': False,
+                    'error': f'Search failed: {str(e)}'
+                }
+                for name in bundle_names
+            }
+    
     async def get_safety_tags(self) -> Dict[str, Any]:
         """Get all safety-related tags"""
-        return await self.search_tags("safety emergency estop", chunk_type_filter="safety_tag", limit=50)
+        return (await self.get_tag_bundles(['safety']))['safety']
     
     async def get_motor_tags(self) -> Dict[str, Any]:
         """Get all motor control tags"""
-        return await self.search_tags("motor drive vfd conveyor", chunk_type_filter="motor_tag", limit=50)
+        return (await self.get_tag_bundles(['motor']))['motor']
     
     async def get_sensor_tags(self) -> Dict[str, Any]:
         """Get all sensor tags"""
-        return await self.search_tags("sensor photoeye proximity switch", chunk_type_filter="sensor_tag", limit=50)
+        return (await self.get_tag_bundles(['sensor']))['sensor']
     
     def get_available_tools(self) -> Dict[str, str]:
         """Get list of available MCP tools"""
-        return {
-            tool.value: f"Tag analysis tool: {tool.value.replace('_', ' ').title()}"
-            for tool in TagMCPTools
-        }
+        return _AVAILABLE_TOOLS
     
     def get_indexing_status(self) -> Dict[str, Any]:
         """Get status of indexed files"""
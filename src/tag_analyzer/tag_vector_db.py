@@ -6,17 +6,22 @@ Creates and manages a vector database for semantic search of Studio 5000 tag CSV
 enabling intelligent search through thousands of I/O points and device mappings.
 """
 
+import hashlib
 import json
 import os
 import pickle
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Set, Tuple
+from dataclasses import dataclass, field
 import logging
+import threading
 import time
+from collections import OrderedDict
 
-from .tag_chunk import TagChunk, TagChunkType, DeviceInfo
+from .tag_chunk import (
+    TagChunk, TagChunkType, DeviceInfo, SERIALIZABLE_METADATA_TYPES, TOP_RELATED_COUNT
+)
 
 # sentence_transformers import moved to lazy load in initialize_model()
 try:
@@ -26,11 +31,108 @@ except ImportError:
     FAISS_AVAILABLE = False
     logging.warning("FAISS not available - falling back to text-based search")
 
+# Optional JIT for the text search scoring loop
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Large tag exports use an IVF-PQ index: embeddings are bucketed into ~sqrt(N)
+# inverted lists and stored as dimension/8 product-quantizer codes of PQ_BITS bits.
+# Smaller exports keep the exact flat index.
+IVF_MIN_TAGS = 2000
+IVF_MAX_NPROBE = 8
+PQ_BITS = 8
+
+# Index/embedding storage options for exports below IVF_MIN_TAGS
+QUANTIZATION_TYPES = {'fp32', 'fp16', 'int8'}
+
+# Inter-op threads for torch; intra-op threads default to half the cores
+TORCH_INTEROP_THREADS = 2
+
+_cpu_threads_configured = False
+
+def _configure_cpu_threads():
+    """Size the OpenMP/MKL/torch thread pools once per process before the first encode"""
+    global _cpu_threads_configured
+    if _cpu_threads_configured:
+        return
+    _cpu_threads_configured = True
+    
+    num_threads = max(1, (os.cpu_count() or 2) // 2)
+    # Explicit environment settings win; must be set before torch initializes OpenMP
+    os.environ.setdefault("OMP_NUM_THREADS", str(num_threads))
+    os.environ.setdefault("MKL_NUM_THREADS", str(num_threads))
+    
+    try:
+        import torch
+        torch.set_num_threads(int(os.environ["OMP_NUM_THREADS"]))
+        torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+    except ImportError:
+        pass
+    except (RuntimeError, ValueError) as e:
+        # set_num_interop_threads fails once parallel work has already started
+        logger.warning(f"Could not configure torch threads: {e}")
+
+def _categorical_codes(values: List[str]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Encode a column of strings as int32 codes plus a value -> code lookup"""
+    if not values:
+        return np.array([], dtype=np.int32), {}
+    categories, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+    return codes.astype(np.int32), {category: code for code, category in enumerate(categories)}
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _accumulate_word_scores(chunk_ids, word_weight, scores, last_word, word_number):
+        """Add word_weight once per chunk id, skipping ids already credited for this word"""
+        for i in range(chunk_ids.size):
+            idx = chunk_ids[i]
+            if last_word[idx] != word_number:
+                last_word[idx] = word_number
+                scores[idx] += word_weight
+
+def _content_key(text: str) -> str:
+    """Stable hash identifying an embedding input"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def _ordered_counts(codes: np.ndarray, categories: List[str],
+                    mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+    """Count occurrences of each code, keyed by category in first-seen order"""
+    if mask is not None:
+        codes = codes[mask]
+    if codes.size == 0:
+        return {}
+    counts = np.bincount(codes, minlength=len(categories))
+    _, first_seen = np.unique(codes, return_index=True)
+    return {categories[code]: int(counts[code]) for code in codes[np.sort(first_seen)]}
+
+# Sentence encoder implementations selectable via encoder_backend
+ENCODER_BACKENDS = {'torch', 'onnx'}
+
+# Batch size for length-sorted embedding of tag texts
+EMBED_BATCH_SIZE = 64
+
+# Number of normalized query embeddings kept for repeated queries
+QUERY_CACHE_SIZE = 1024
+
+# Sections reported by analyze_i_o_usage
+USAGE_SECTIONS = frozenset({
+    'by_device_category', 'by_chunk_type', 'by_module', 'safety_analysis',
+    'motor_analysis', 'sensor_analysis', 'module_utilization'
+})
+
+# Index candidates fetched per requested result (and growth factor when filters underfill)
+SEARCH_OVERSAMPLE = 4
+
+# Candidates re-scored with exact embeddings when ranking must be precise
+RERANK_CANDIDATES = 200
+
+@dataclass(slots=True)
 class TagSearchResult:
     """Represents a search result from tag database"""
     tag_name: str
@@ -41,31 +143,116 @@ class TagSearchResult:
     score: float
     device_info: DeviceInfo
     i_o_address: str
-    related_tags: List[str] = None
-    metadata: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.related_tags is None:
-            self.related_tags = []
-        if self.metadata is None:
-            self.metadata = {}
+    related_tags: List[str] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    chunk: Optional[TagChunk] = field(default=None, repr=False, compare=False)
+    
+    @classmethod
+    def from_chunk(cls, chunk: TagChunk, score: float) -> 'TagSearchResult':
+        """Build a search result for a tag chunk"""
+        return cls(
+            tag_name=chunk.tag_name,
+            chunk_type=chunk.chunk_type,
+            description=chunk.description,
+            function=chunk.function,
+            category=chunk.category,
+            score=score,
+            device_info=chunk.device_info,
+            i_o_address=chunk.device_info.local_address or chunk.device_info.module_type,
+            related_tags=chunk.related_tags,
+            metadata=chunk.metadata,
+            chunk=chunk
+        )
+    
+    @property
+    def top_related(self) -> Tuple[str, ...]:
+        """Leading related tag names (shared with the source chunk)"""
+        if self.chunk is not None:
+            return self.chunk.top_related
+        return tuple(self.related_tags[:TOP_RELATED_COUNT])
+    
+    @property
+    def json_device_info(self) -> Dict[str, Any]:
+        """Serialized device information (shared with the source chunk)"""
+        if self.chunk is not None:
+            return self.chunk.json_device_info
+        return self.device_info.to_dict()
+    
+    @property
+    def json_metadata(self) -> Dict[str, Any]:
+        """JSON-safe metadata (shared with the source chunk)"""
+        if self.chunk is not None:
+            return self.chunk.json_metadata
+        return {k: v for k, v in self.metadata.items()
+                if isinstance(v, SERIALIZABLE_METADATA_TYPES)}
 
 class TagVectorDatabase:
     """Vector database for Studio 5000 tag CSV data"""
     
-    def __init__(self, cache_dir: str = "tag_vector_cache"):
+    def __init__(self, cache_dir: str = "tag_vector_cache", quantization: str = "fp16",
+                 encoder_backend: str = "torch"):
+        """
+        Args:
+            cache_dir: Directory for the cached index, embeddings and chunks
+            quantization: Storage for exports below the IVF-PQ threshold -
+                'fp32' (exact), 'fp16' (default) or 'int8' (scalar quantized, no
+                separate embedding matrix is kept)
+            encoder_backend: 'torch' (SentenceTransformer) or 'onnx' (INT8 ONNX Runtime,
+                exported on first use into cache_dir/onnx)
+        """
+        if quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Unknown quantization '{quantization}', expected one of {sorted(QUANTIZATION_TYPES)}")
+        if encoder_backend not in ENCODER_BACKENDS:
+            raise ValueError(f"Unknown encoder backend '{encoder_backend}', expected one of {sorted(ENCODER_BACKENDS)}")
+        
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.quantization = quantization
+        self._encoder_backend = encoder_backend
         
         # Initialize sentence transformer for embeddings
         self.model = None
         self.index = None
         self.tag_chunks = []
         self.embeddings = None
+        self._embedding_keys: List[str] = []  # Content hash of each embeddings row
+        
+        # LRU of normalized query embeddings (queries run on several threads)
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        
+        # Exact-match lookup indices over tag_chunks (see _build_lookup_indices)
+        self._by_module: Dict[Tuple[Optional[int], Optional[int]], np.ndarray] = {}
+        self._by_name: Dict[str, TagChunk] = {}
+        self._io_search_keys: List[Tuple[str, str]] = []
+        self._token_index: Dict[str, np.ndarray] = {}
+        
+        # Structure-of-arrays columns parallel to tag_chunks for vectorized filters;
+        # missing rack/slot is stored as -1, categories as integer codes
+        self._racks = np.array([], dtype=np.int32)
+        self._slots = np.array([], dtype=np.int32)
+        self._category_codes = np.array([], dtype=np.int32)
+        self._category_lookup: Dict[str, int] = {}
+        self._chunk_type_codes = np.array([], dtype=np.int32)
+        self._chunk_type_lookup: Dict[str, int] = {}
+        
+        # Bumped whenever tag_chunks changes; keys the memoized usage analysis
+        self._generation = 0
+        self._usage_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        
+        # Columns for analyze_i_o_usage
+        self._device_category_codes = np.array([], dtype=np.int32)
+        self._device_categories: List[str] = []
+        self._function_codes = np.array([], dtype=np.int32)
+        self._functions: List[str] = []
+        self._is_safety = np.array([], dtype=bool)
+        self._is_motor = np.array([], dtype=bool)
+        self._is_sensor = np.array([], dtype=bool)
+        self._is_vfd_module = np.array([], dtype=bool)
         
         # Cache file paths
         self.index_cache = self.cache_dir / "tag_index.faiss"
-        self.embeddings_cache = self.cache_dir / "tag_embeddings.pkl"
+        self.embeddings_cache = self.cache_dir / "tag_embeddings.npy"
         self.data_cache = self.cache_dir / "tag_chunks.pkl"
         self.metadata_cache = self.cache_dir / "tag_metadata.json"
         
@@ -74,6 +261,19 @@ class TagVectorDatabase:
     
     def initialize_model(self):
         """Initialize the sentence transformer model"""
+        if self.model is None:
+            _configure_cpu_threads()
+        
+        if self.model is None and self._encoder_backend == 'onnx':
+            logger.info("Loading ONNX Runtime INT8 encoder...")
+            try:
+                from .onnx_encoder import OnnxSentenceEncoder
+                self.model = OnnxSentenceEncoder(self.cache_dir / "onnx")
+                logger.info("ONNX encoder loaded successfully")
+            except Exception as e:
+                logger.warning(f"ONNX encoder unavailable ({e}), falling back to sentence transformer")
+                self.model = None
+        
         if self.model is None:
             logger.info("Loading sentence transformer model...")
             try:
@@ -95,7 +295,11 @@ class TagVectorDatabase:
         
         logger.info(f"Building tag vector database for {len(tag_chunks)} tag chunks...")
         
+        if force_rebuild:
+            self._clear_query_cache()
+        
         self.tag_chunks = tag_chunks
+        self._build_lookup_indices()
         self.initialize_model()
         
         if self.model is None or not FAISS_AVAILABLE:
@@ -110,26 +314,148 @@ class TagVectorDatabase:
             texts_to_embed.append(text)
         
         logger.info("Creating embeddings...")
-        start_time = time.time()
-        self.embeddings = self.model.encode(texts_to_embed, show_progress_bar=True)
-        embedding_time = time.time() - start_time
+        start_time = time.perf_counter()
+        self.embeddings, self._embedding_keys = self._embed_incrementally(texts_to_embed)
+        embedding_time = time.perf_counter() - start_time
         logger.info(f"Created {len(self.embeddings)} embeddings in {embedding_time:.2f} seconds")
         
-        # Build FAISS index for fast similarity search
+        # Build FAISS index for fast similarity search (embeddings are already
+        # normalized float32, so the index takes them without a copy)
         logger.info("Building FAISS index...")
-        dimension = self.embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(dimension)  # Inner product for cosine similarity
+        self.index = self._build_index(self.embeddings)
         
-        # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(self.embeddings)
-        self.index.add(self.embeddings.astype(np.float32))
+        # Embeddings are only kept for reranking and caching; int8 codes live in the index
+        if self.quantization == 'int8':
+            self.embeddings = None
+            self._embedding_keys = []
+        elif self.quantization == 'fp16':
+            self.embeddings = self.embeddings.astype(np.float16)
         
         # Save to cache
         self._save_to_cache()
         logger.info("Tag vector database built and cached successfully")
     
+    def _embed_incrementally(self, texts: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Embed texts, reusing previous rows for texts whose content hash is unchanged
+        
+        Returns the L2-normalized embeddings (float32, rows in text order) and the
+        content key of each row. Only new or edited texts go through the encoder and
+        normalization; reused rows were normalized when they were first built.
+        """
+        keys = [_content_key(text) for text in texts]
+        previous_embeddings, previous_keys = self._previous_embeddings()
+        known = {key: row for row, key in enumerate(previous_keys)}
+        
+        missing = [i for i, key in enumerate(keys) if key not in known]
+        if len(missing) == len(texts):
+            embeddings = self._encode_texts(texts)
+            faiss.normalize_L2(embeddings)
+            return embeddings, keys
+        
+        logger.info(f"Reusing {len(texts) - len(missing)} cached embeddings, encoding {len(missing)}")
+        embeddings = np.empty((len(texts), previous_embeddings.shape[1]), dtype=np.float32)
+        reused = [i for i, key in enumerate(keys) if key in known]
+        embeddings[reused] = previous_embeddings[[known[keys[i]] for i in reused]]
+        if missing:
+            new_embeddings = self._encode_texts([texts[i] for i in missing])
+            faiss.normalize_L2(new_embeddings)
+            embeddings[missing] = new_embeddings
+        return embeddings, keys
+    
+    def _previous_embeddings(self) -> Tuple[Optional[np.ndarray], List[str]]:
+        """Embeddings and content keys from the last build, in memory or on disk"""
+        
+        if self.embeddings is not None and len(self._embedding_keys) == len(self.embeddings):
+            return self.embeddings, self._embedding_keys
+        
+        try:
+            keys = self._read_embedding_keys()
+            if keys and self.embeddings_cache.exists():
+                embeddings = np.load(self.embeddings_cache, mmap_mode='r')
+                if len(keys) == len(embeddings):
+                    return embeddings, keys
+        except Exception as e:
+            logger.warning(f"Ignoring cached embeddings: {e}")
+        
+        return None, []
+    
+    def _read_embedding_keys(self) -> List[str]:
+        """Cached embedding content keys, if they were produced by the current encoder"""
+        
+        if not self.metadata_cache.exists():
+            return []
+        with open(self.metadata_cache, 'r') as f:
+            metadata = json.load(f)
+        if metadata.get('encoder') != type(self.model).__name__:
+            return []
+        return metadata.get('embedding_keys', [])
+    
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts in length-sorted batches
+        
+        Tag texts range from bare bit names to long descriptions; sorting by token
+        length keeps similar lengths together so batches carry little padding.
+        Rows are returned in the original text order.
+        """
+        tokenizer = getattr(self.model, 'tokenizer', None)
+        if tokenizer is not None:
+            lengths = [len(tokenizer.tokenize(text)) for text in texts]
+        else:
+            lengths = [len(text) for text in texts]
+        
+        order = np.argsort(lengths, kind='stable')
+        sorted_embeddings = self.model.encode([texts[i] for i in order],
+                                              batch_size=EMBED_BATCH_SIZE,
+                                              show_progress_bar=True,
+                                              convert_to_numpy=True)
+        
+        embeddings = np.empty(sorted_embeddings.shape, dtype=np.float32)
+        embeddings[order] = sorted_embeddings
+        return embeddings
+    
+    def _build_index(self, embeddings: np.ndarray):
+        """Build the FAISS index: exact inner product, or FP16 scalar quantizer, or IVF-PQ for large exports"""
+        
+        count, dimension = embeddings.shape
+        if count >= IVF_MIN_TAGS and dimension % 8 == 0:
+            nlist = max(4, int(np.sqrt(count)))
+            factory = f"IVF{nlist},PQ{dimension // 8}x{PQ_BITS}"
+            logger.info(f"Using {factory} index for {count} tags")
+            index = faiss.index_factory(dimension, factory, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+        elif self.quantization == 'fp32':
+            index = faiss.IndexFlatIP(dimension)  # Inner product for cosine similarity
+        else:
+            # FP16 codes halve index memory with negligible loss on normalized embeddings;
+            # int8 codes quarter it (embeddings are L2-normalized, so the range is bounded)
+            qtype = (faiss.ScalarQuantizer.QT_8bit if self.quantization == 'int8'
+                     else faiss.ScalarQuantizer.QT_fp16)
+            index = faiss.IndexScalarQuantizer(dimension, qtype, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+        
+        index.add(embeddings)
+        self._configure_index(index)
+        return index
+    
+    def _configure_index(self, index):
+        """Apply search-time parameters to a built or loaded index"""
+        if hasattr(index, 'nprobe'):
+            index.nprobe = min(index.nlist, IVF_MAX_NPROBE)
+    
+    @property
+    def index_is_exact(self) -> bool:
+        """Whether index scores are (near-)exact cosine similarities, i.e. flat or FP16"""
+        if not FAISS_AVAILABLE:
+            return False
+        if isinstance(self.index, faiss.IndexScalarQuantizer):
+            return self.index.sq.qtype == faiss.ScalarQuantizer.QT_fp16
+        return isinstance(self.index, faiss.IndexFlat)
+    
     def search_tags(self, query: str, limit: int = 20, score_threshold: float = 0.3,
-                   category_filter: str = None, chunk_type_filter: TagChunkType = None) -> List[TagSearchResult]:
+                   category_filter: str = None, chunk_type_filter: TagChunkType = None,
+                   rerank: bool = False) -> List[TagSearchResult]:
         """
         Search tags using vector similarity
         
@@ -139,6 +465,7 @@ class TagVectorDatabase:
             score_threshold: Minimum similarity score
             category_filter: Filter by device category (VFD, Safety, etc.)
             chunk_type_filter: Filter by chunk type
+            rerank: Re-score quantized candidates with exact embeddings
             
         Returns:
             List of search results ranked by similarity
@@ -152,41 +479,11 @@ class TagVectorDatabase:
             return self._text_search(query, limit, category_filter, chunk_type_filter)
         
         try:
-            # Create embedding for the query
-            query_embedding = self.model.encode([query])
-            faiss.normalize_L2(query_embedding)
-            
-            # Search the index
-            scores, indices = self.index.search(query_embedding.astype(np.float32), 
-                                              min(limit * 2, len(self.tag_chunks)))
+            # Create (or reuse) the normalized embedding for the query
+            query_embedding = self._encode_queries([query])
             
-            results = []
-            for score, idx in zip(scores[0], indices[0]):
-                if score >= score_threshold and idx < len(self.tag_chunks):
-                    chunk = self.tag_chunks[idx]
-                    
-                    # Apply filters
-                    if category_filter and chunk.device_info.device_category.lower() != category_filter.lower():
-                        continue
-                    if chunk_type_filter and chunk.chunk_type != chunk_type_filter:
-                        continue
-                    
-                    result = TagSearchResult(
-                        tag_name=chunk.tag_name,
-                        chunk_type=chunk.chunk_type,
-                        description=chunk.description,
-                        function=chunk.function,
-                        category=chunk.category,
-                        score=float(score),
-                        device_info=chunk.device_info,
-                        i_o_address=chunk.device_info.local_address or chunk.device_info.module_type,
-                        related_tags=chunk.related_tags,
-                        metadata=chunk.metadata
-                    )
-                    results.append(result)
-                    
-                    if len(results) >= limit:
-                        break
+            results = self._search_filtered(query_embedding, limit, score_threshold,
+                                            [category_filter], [chunk_type_filter], rerank)[0]
             
             logger.info(f"Found {len(results)} tag results for query: {query}")
             return results
@@ -195,6 +492,151 @@ class TagVectorDatabase:
             logger.error(f"Vector search failed: {e}")
             return self._text_search(query, limit, category_filter, chunk_type_filter)
     
+    def search_tags_batch(self, queries: List[str], limit: int = 20, score_threshold: float = 0.3,
+                          chunk_type_filters: List[TagChunkType] = None,
+                          rerank: bool = False) -> List[List[TagSearchResult]]:
+        """
+        Search several queries with a single encoder pass and a single index lookup
+        
+        Args:
+            queries: Search queries
+            limit: Maximum results to return per query
+            score_threshold: Minimum similarity score
+            chunk_type_filters: Optional chunk type filter per query (same order as queries)
+            rerank: Re-score quantized candidates with exact embeddings
+            
+        Returns:
+            One list of search results per query, in query order
+        """
+        if chunk_type_filters is None:
+            chunk_type_filters = [None] * len(queries)
+        
+        if not self.tag_chunks:
+            logger.warning("No tag data has been indexed")
+            return [[] for _ in queries]
+        
+        if not self.model or not self.index:
+            logger.warning("Vector search not available, falling back to text search")
+            return [self._text_search(query, limit, None, chunk_type_filter)
+                    for query, chunk_type_filter in zip(queries, chunk_type_filters)]
+        
+        try:
+            query_embeddings = self._encode_queries(queries)
+            return self._search_filtered(query_embeddings, limit, score_threshold,
+                                         [None] * len(queries), chunk_type_filters, rerank)
+            
+        except Exception as e:
+            logger.error(f"Batched vector search failed: {e}")
+            return [self._text_search(query, limit, None, chunk_type_filter)
+                    for query, chunk_type_filter in zip(queries, chunk_type_filters)]
+    
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Return L2-normalized float32 query embeddings, one row per query
+        
+        Embeddings are memoized per exact query string; only queries missing from
+        the cache go through the encoder, in a single batch.
+        """
+        with self._query_cache_lock:
+            cached = {}
+            for query in queries:
+                if query in self._query_cache:
+                    self._query_cache.move_to_end(query)
+                    cached[query] = self._query_cache[query]
+        
+        missing = list(dict.fromkeys(query for query in queries if query not in cached))
+        if missing:
+            new_embeddings = np.asarray(self.model.encode(missing, batch_size=len(missing)),
+                                        dtype=np.float32)
+            faiss.normalize_L2(new_embeddings)
+            
+            with self._query_cache_lock:
+                for query, embedding in zip(missing, new_embeddings):
+                    cached[query] = embedding
+                    self._query_cache[query] = embedding
+                while len(self._query_cache) > QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+        
+        return np.stack([cached[query] for query in queries])
+    
+    def _clear_query_cache(self):
+        """Forget memoized query embeddings"""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+    
+    def _search_filtered(self, query_embeddings: np.ndarray, limit: int, score_threshold: float,
+                         category_filters: List[Optional[str]],
+                         chunk_type_filters: List[Optional[TagChunkType]],
+                         rerank: bool) -> List[List[TagSearchResult]]:
+        """
+        Filtered results per query row, best first
+        
+        Rows whose filters leave them short are searched again with a wider k while
+        further candidates could still pass the score threshold; rows that are
+        already full are not searched again.
+        """
+        results: List[List[TagSearchResult]] = [[] for _ in range(len(query_embeddings))]
+        pending = list(range(len(query_embeddings)))
+        k = min(max(limit * SEARCH_OVERSAMPLE, RERANK_CANDIDATES if rerank else 0),
+                len(self.tag_chunks))
+        
+        while pending:
+            rows = self._search_rows(query_embeddings[pending], k, rerank)
+            short = []
+            for position, (scores, indices) in zip(pending, rows):
+                results[position] = self._collect_results(scores, indices, limit, score_threshold,
+                                                          category_filters[position],
+                                                          chunk_type_filters[position])
+                if not (len(results[position]) >= limit or k >= len(self.tag_chunks) or
+                        not len(scores) or scores[-1] < score_threshold):
+                    short.append(position)
+            pending = short
+            k = min(k * SEARCH_OVERSAMPLE, len(self.tag_chunks))
+        
+        return results
+    
+    def _search_rows(self, query_embeddings: np.ndarray, k: int,
+                     rerank: bool) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Top-k (scores, indices) per query row, best first"""
+        
+        if rerank and not self.index_is_exact and self.embeddings is not None:
+            return self._search_reranked(query_embeddings, k)
+        
+        scores, indices = self.index.search(query_embeddings, k)
+        return list(zip(scores, indices))
+    
+    def _search_reranked(self, query_embeddings: np.ndarray,
+                         candidates: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Search the quantized index, then re-score each query's top candidates exactly"""
+        
+        _, indices = self.index.search(query_embeddings, min(candidates, len(self.tag_chunks)))
+        
+        rows = []
+        for query_embedding, row_indices in zip(query_embeddings, indices):
+            candidate_ids = row_indices[row_indices >= 0]
+            exact_scores = self.embeddings[candidate_ids].astype(np.float32) @ query_embedding
+            order = np.argsort(-exact_scores)
+            rows.append((exact_scores[order], candidate_ids[order]))
+        return rows
+    
+    def _collect_results(self, scores, indices, limit: int, score_threshold: float,
+                         category_filter: str = None,
+                         chunk_type_filter: TagChunkType = None) -> List[TagSearchResult]:
+        """Turn one row of FAISS scores/indices into filtered search results"""
+        
+        # FAISS pads rows it cannot fill with index -1
+        keep = (scores >= score_threshold) & (indices >= 0) & (indices < len(self.tag_chunks))
+        
+        # Apply filters on the SoA columns; results are only built for survivors
+        mask = self._filter_mask(category_filter, chunk_type_filter)
+        if mask is not None:
+            keep &= mask[np.where(keep, indices, 0)]
+        
+        # Rows are already sorted best first, so the first survivors are the top results
+        selected = np.flatnonzero(keep)[:limit]
+        return [TagSearchResult.from_chunk(self.tag_chunks[idx], float(score))
+                for score, idx in zip(scores[selected], indices[selected])]
+    
     def find_device_by_description(self, description: str, device_type: str = None) -> List[TagSearchResult]:
         """Find specific devices by description or function"""
         
@@ -207,26 +649,9 @@ class TagVectorDatabase:
     def get_tags_by_module(self, rack: int, slot: int) -> List[TagSearchResult]:
         """Get all tags for a specific module (rack/slot)"""
         
-        results = []
-        for chunk in self.tag_chunks:
-            if (chunk.device_info.rack == rack and 
-                chunk.device_info.slot == slot):
-                
-                result = TagSearchResult(
-                    tag_name=chunk.tag_name,
-                    chunk_type=chunk.chunk_type,
-                    description=chunk.description,
-                    function=chunk.function,
-                    category=chunk.category,
-                    score=1.0,  # Perfect match for module location
-                    device_info=chunk.device_info,
-                    i_o_address=chunk.device_info.local_address or chunk.device_info.module_type,
-                    related_tags=chunk.related_tags,
-                    metadata=chunk.metadata
-                )
-                results.append(result)
-        
-        return sorted(results, key=lambda x: x.tag_name)
+        # Perfect match for module location; index lists are pre-sorted by tag name
+        return [TagSearchResult.from_chunk(self.tag_chunks[idx], 1.0)
+                for idx in self._by_module.get((rack, slot), ())]
     
     def find_i_o_point(self, address_pattern: str = None, description: str = None) -> List[TagSearchResult]:
         """Find specific I/O points by address pattern or description"""
@@ -235,191 +660,166 @@ class TagVectorDatabase:
             return self.search_tags(description, limit=10)
         
         if address_pattern:
-            results = []
-            for chunk in self.tag_chunks:
-                if (address_pattern.lower() in chunk.device_info.local_address.lower() or
-                    address_pattern.lower() in chunk.tag_name.lower()):
-                    
-                    result = TagSearchResult(
-                        tag_name=chunk.tag_name,
-                        chunk_type=chunk.chunk_type,
-                        description=chunk.description,
-                        function=chunk.function,
-                        category=chunk.category,
-                        score=1.0,
-                        device_info=chunk.device_info,
-                        i_o_address=chunk.device_info.local_address or chunk.device_info.module_type,
-                        related_tags=chunk.related_tags,
-                        metadata=chunk.metadata
-                    )
-                    results.append(result)
-            
-            return results
+            pattern = address_pattern.lower()
+            return [TagSearchResult.from_chunk(self.tag_chunks[idx], 1.0)
+                    for idx, (address_key, name_key) in enumerate(self._io_search_keys)
+                    if pattern in address_key or pattern in name_key]
         
         return []
     
     def find_related_tags(self, tag_name: str, relationship_type: str = "all") -> List[TagSearchResult]:
         """Find tags related to a given tag"""
+        return self.find_related_tags_batch([tag_name], relationship_type)[0]
+    
+    def find_related_tags_batch(self, tag_names: List[str],
+                                relationship_type: str = "all") -> List[List[TagSearchResult]]:
+        """
+        Find tags related to each of several tags
         
-        # Find the target tag
-        target_chunk = None
-        for chunk in self.tag_chunks:
-            if chunk.tag_name == tag_name:
-                target_chunk = chunk
-                break
+        The functional-similarity queries of all targets are encoded and searched as
+        one batch. Results are returned per tag name, in input order.
+        """
+        targets = [self._by_name.get(tag_name) for tag_name in tag_names]
         
-        if not target_chunk:
-            return []
+        # Search for similar function/description for every known target at once
+        functional_by_target = {}
+        if relationship_type == "all" or relationship_type == "functional":
+            queried = [i for i, target_chunk in enumerate(targets) if target_chunk]
+            if queried:
+                batches = self.search_tags_batch(
+                    [f"{targets[i].function} {targets[i].description}" for i in queried],
+                    limit=5,
+                    score_threshold=0.4,
+                    rerank=True
+                )
+                functional_by_target = dict(zip(queried, batches))
         
-        results = []
-        
-        # Get explicitly related tags
-        for related_tag_name in target_chunk.related_tags:
-            for chunk in self.tag_chunks:
-                if chunk.tag_name == related_tag_name:
-                    result = TagSearchResult(
-                        tag_name=chunk.tag_name,
-                        chunk_type=chunk.chunk_type,
-                        description=chunk.description,
-                        function=chunk.function,
-                        category=chunk.category,
-                        score=0.9,  # High score for explicit relationships
-                        device_info=chunk.device_info,
-                        i_o_address=chunk.device_info.local_address or chunk.device_info.module_type,
-                        related_tags=chunk.related_tags,
-                        metadata=chunk.metadata
-                    )
+        related = []
+        for i, (tag_name, target_chunk) in enumerate(zip(tag_names, targets)):
+            if not target_chunk:
+                related.append([])
+                continue
+            
+            results = []
+            
+            # Get explicitly related tags
+            for related_tag_name in target_chunk.related_tags:
+                chunk = self._by_name.get(related_tag_name)
+                if chunk is not None:
+                    result = TagSearchResult.from_chunk(chunk, 0.9)  # High score for explicit relationships
                     results.append(result)
-                    break
-        
-        # Also search for similar function/description
-        if relationship_type == "all" or relationship_type == "functional":
-            functional_results = self.search_tags(
-                f"{target_chunk.function} {target_chunk.description}",
-                limit=5,
-                score_threshold=0.4
-            )
             
             # Add functional relationships with lower score
-            for result in functional_results:
+            for result in functional_by_target.get(i, []):
                 if result.tag_name != tag_name:
                     result.score = result.score * 0.8  # Reduce score for functional relationships
                     results.append(result)
+            
+            # Remove duplicates and sort by score
+            seen_tags = set()
+            unique_results = []
+            for result in sorted(results, key=lambda x: x.score, reverse=True):
+                if result.tag_name not in seen_tags:
+                    unique_results.append(result)
+                    seen_tags.add(result.tag_name)
+            
+            related.append(unique_results[:15])  # Limit results
         
-        # Remove duplicates and sort by score
-        seen_tags = set()
-        unique_results = []
-        for result in sorted(results, key=lambda x: x.score, reverse=True):
-            if result.tag_name not in seen_tags:
-                unique_results.append(result)
-                seen_tags.add(result.tag_name)
-        
-        return unique_results[:15]  # Limit results
-    
-    def analyze_i_o_usage(self) -> Dict[str, Any]:
-        """Analyze I/O usage and capacity across the system"""
-        
-        analysis = {
-            'total_tags': len(self.tag_chunks),
-            'by_device_category': {},
-            'by_chunk_type': {},
-            'by_module': {},
-            'safety_analysis': {},
-            'motor_analysis': {},
-            'sensor_analysis': {},
-            'module_utilization': []
-        }
+        return related
+    
+    def analyze_i_o_usage(self, sections: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Analyze I/O usage and capacity across the system
         
-        module_usage = {}
-        safety_tags = []
-        motor_tags = []
-        sensor_tags = []
+        Args:
+            sections: Analysis sections to compute (see USAGE_SECTIONS); all when None.
+                'total_tags' is always included.
         
-        for chunk in self.tag_chunks:
-            # Device category analysis
-            category = chunk.device_info.device_category
-            if category:
-                analysis['by_device_category'][category] = (
-                    analysis['by_device_category'].get(category, 0) + 1
-                )
-            
-            # Chunk type analysis
-            chunk_type = chunk.chunk_type.value
-            analysis['by_chunk_type'][chunk_type] = (
-                analysis['by_chunk_type'].get(chunk_type, 0) + 1
-            )
-            
-            # Module analysis
-            if chunk.device_info.rack is not None and chunk.device_info.slot is not None:
-                module_key = f"Rack{chunk.device_info.rack}_Slot{chunk.device_info.slot}"
-                if module_key not in module_usage:
-                    module_usage[module_key] = {
-                        'count': 0,
-                        'module_type': chunk.device_info.module_type,
-                        'device_category': chunk.device_info.device_category,
-                        'rack': chunk.device_info.rack,
-                        'slot': chunk.device_info.slot
+        Returns:
+            Analysis dictionary. The full analysis is memoized until the tag data
+            changes, so callers must not modify it.
+        """
+        if sections is not None and not sections <= USAGE_SECTIONS:
+            raise ValueError(f"Unknown analysis sections {sorted(sections - USAGE_SECTIONS)}")
+        
+        cached = self._usage_cache
+        if cached is not None and cached[0] == self._generation:
+            full_analysis = cached[1]
+            if sections is None:
+                return full_analysis
+            return {key: value for key, value in full_analysis.items()
+                    if key == 'total_tags' or key in sections}
+        
+        wanted = USAGE_SECTIONS if sections is None else sections
+        analysis = {'total_tags': len(self.tag_chunks)}
+        
+        # Device category and chunk type analysis (uncategorized tags are not counted)
+        if 'by_device_category' in wanted:
+            by_device_category = _ordered_counts(self._device_category_codes, self._device_categories)
+            by_device_category.pop('', None)
+            analysis['by_device_category'] = by_device_category
+        if 'by_chunk_type' in wanted:
+            analysis['by_chunk_type'] = _ordered_counts(self._chunk_type_codes, list(self._chunk_type_lookup))
+        
+        # Module analysis: one group per (rack, slot), described by its first tag
+        module_usage = {}
+        if 'by_module' in wanted or 'module_utilization' in wanted:
+            module_rows = np.flatnonzero((self._racks >= 0) & (self._slots >= 0))
+            if module_rows.size:
+                locations = np.stack([self._racks[module_rows], self._slots[module_rows]], axis=1)
+                _, first_rows, counts = np.unique(locations, axis=0, return_index=True, return_counts=True)
+                for group in np.argsort(first_rows):
+                    device_info = self.tag_chunks[module_rows[first_rows[group]]].device_info
+                    module_usage[f"Rack{device_info.rack}_Slot{device_info.slot}"] = {
+                        'count': int(counts[group]),
+                        'module_type': device_info.module_type,
+                        'device_category': device_info.device_category,
+                        'rack': device_info.rack,
+                        'slot': device_info.slot
                     }
-                module_usage[module_key]['count'] += 1
-            
-            # Collect special categories
-            if chunk.is_safety_tag:
-                safety_tags.append(chunk)
-            if chunk.is_motor_control:
-                motor_tags.append(chunk)
-            if chunk.is_sensor:
-                sensor_tags.append(chunk)
         
-        analysis['by_module'] = module_usage
+        if 'by_module' in wanted:
+            analysis['by_module'] = module_usage
         
         # Safety analysis
-        analysis['safety_analysis'] = {
-            'total_safety_tags': len(safety_tags),
-            'safety_types': {},
-            'safety_locations': {}
-        }
-        
-        for chunk in safety_tags:
-            safety_func = chunk.function
-            analysis['safety_analysis']['safety_types'][safety_func] = (
-                analysis['safety_analysis']['safety_types'].get(safety_func, 0) + 1
-            )
+        if 'safety_analysis' in wanted:
+            analysis['safety_analysis'] = {
+                'total_safety_tags': int(np.count_nonzero(self._is_safety)),
+                'safety_types': _ordered_counts(self._function_codes, self._functions, self._is_safety),
+                'safety_locations': {}
+            }
         
         # Motor analysis
-        analysis['motor_analysis'] = {
-            'total_motor_tags': len(motor_tags),
-            'motor_types': {},
-            'vfd_count': 0
-        }
-        
-        for chunk in motor_tags:
-            if 'vfd' in chunk.device_info.module_type.lower():
-                analysis['motor_analysis']['vfd_count'] += 1
+        if 'motor_analysis' in wanted:
+            analysis['motor_analysis'] = {
+                'total_motor_tags': int(np.count_nonzero(self._is_motor)),
+                'motor_types': {},
+                'vfd_count': int(np.count_nonzero(self._is_motor & self._is_vfd_module))
+            }
         
         # Sensor analysis  
-        analysis['sensor_analysis'] = {
-            'total_sensor_tags': len(sensor_tags),
-            'sensor_types': {}
-        }
-        
-        for chunk in sensor_tags:
-            sensor_func = chunk.function
-            analysis['sensor_analysis']['sensor_types'][sensor_func] = (
-                analysis['sensor_analysis']['sensor_types'].get(sensor_func, 0) + 1
-            )
+        if 'sensor_analysis' in wanted:
+            analysis['sensor_analysis'] = {
+                'total_sensor_tags': int(np.count_nonzero(self._is_sensor)),
+                'sensor_types': _ordered_counts(self._function_codes, self._functions, self._is_sensor)
+            }
         
         # Module utilization summary
-        analysis['module_utilization'] = [
-            {
-                'module': module_key,
-                'rack': info['rack'],
-                'slot': info['slot'],
-                'type': info['module_type'],
-                'category': info['device_category'],
-                'tag_count': info['count']
-            }
-            for module_key, info in module_usage.items()
-        ]
+        if 'module_utilization' in wanted:
+            analysis['module_utilization'] = [
+                {
+                    'module': module_key,
+                    'rack': info['rack'],
+                    'slot': info['slot'],
+                    'type': info['module_type'],
+                    'category': info['device_category'],
+                    'tag_count': info['count']
+                }
+                for module_key, info in module_usage.items()
+            ]
+        
+        if sections is None:
+            self._usage_cache = (self._generation, analysis)
         
         return analysis
     
@@ -431,16 +831,17 @@ class TagVectorDatabase:
             'by_category': {},
             'by_function': {},
             'by_location': {},
-            'recent_analysis': self.analyze_i_o_usage()
+            'recent_analysis': self.analyze_i_o_usage()  # Memoized per tag data version
         }
         
         # Count unique devices (not individual I/O points)
         unique_devices = set()
         
-        for chunk in self.tag_chunks:
-            if category_filter and chunk.device_info.device_category.lower() != category_filter.lower():
-                continue
-            
+        # Category filter is resolved once against the precomputed lowered categories
+        mask = self._filter_mask(category_filter)
+        chunks = self.tag_chunks if mask is None else [self.tag_chunks[idx] for idx in np.flatnonzero(mask)]
+        
+        for chunk in chunks:
             # Create device identifier
             device_id = f"{chunk.device_info.module_type}_{chunk.device_info.rack}_{chunk.device_info.slot}"
             unique_devices.add(device_id)
@@ -462,43 +863,116 @@ class TagVectorDatabase:
                     chunk_type_filter: TagChunkType = None) -> List[TagSearchResult]:
         """Fallback text-based search"""
         
-        results = []
-        query_lower = query.lower()
+        query_words = query.lower().split()
+        if not query_words or not self.tag_chunks:
+            return []
         
-        for chunk in self.tag_chunks:
-            # Apply filters
-            if category_filter and chunk.device_info.device_category.lower() != category_filter.lower():
-                continue
-            if chunk_type_filter and chunk.chunk_type != chunk_type_filter:
+        # Simple text matching score: each query word found in a chunk's searchable
+        # text adds 1/len(query_words). A word matches a chunk when it is a substring
+        # of one of its whitespace tokens, so postings of every such token are merged.
+        scores = np.zeros(len(self.tag_chunks), dtype=np.float64)
+        word_weight = 1.0 / len(query_words)
+        if NUMBA_AVAILABLE:
+            last_word = np.full(len(self.tag_chunks), -1, dtype=np.int32)
+        for word_number, word in enumerate(query_words):
+            postings = [ids for token, ids in self._token_index.items() if word in token]
+            if not postings:
                 continue
-            
-            searchable = chunk.searchable_text.lower()
-            
-            # Simple text matching score
-            score = 0.0
-            query_words = query_lower.split()
-            for word in query_words:
-                if word in searchable:
-                    score += 1.0 / len(query_words)
-            
-            if score > 0:
-                result = TagSearchResult(
-                    tag_name=chunk.tag_name,
-                    chunk_type=chunk.chunk_type,
-                    description=chunk.description,
-                    function=chunk.function,
-                    category=chunk.category,
-                    score=score,
-                    device_info=chunk.device_info,
-                    i_o_address=chunk.device_info.local_address or chunk.device_info.module_type,
-                    related_tags=chunk.related_tags,
-                    metadata=chunk.metadata
-                )
-                results.append(result)
+            chunk_ids = np.concatenate(postings)
+            if NUMBA_AVAILABLE:
+                _accumulate_word_scores(chunk_ids, word_weight, scores, last_word, word_number)
+            else:
+                scores[np.unique(chunk_ids)] += word_weight
+        
+        # Apply filters
+        mask = self._filter_mask(category_filter, chunk_type_filter)
+        if mask is not None:
+            scores[~mask] = 0.0
+        
+        candidates = np.flatnonzero(scores > 0)
+        if candidates.size > limit:
+            # Keep everything scoring at least the limit-th best score (ties included)
+            cutoff = -np.partition(-scores[candidates], limit - 1)[limit - 1]
+            candidates = candidates[scores[candidates] >= cutoff]
+        
+        # Sort by score (ties keep chunk order) and return top results
+        top = candidates[np.lexsort((candidates, -scores[candidates]))][:limit]
+        return [TagSearchResult.from_chunk(self.tag_chunks[idx], float(scores[idx])) for idx in top]
+    
+    def _build_lookup_indices(self):
+        """Build rack/slot, tag name, I/O address and text token indices over tag_chunks"""
+        
+        self._generation += 1
+        
+        self._racks = np.array([-1 if chunk.device_info.rack is None else chunk.device_info.rack
+                                for chunk in self.tag_chunks], dtype=np.int32)
+        self._slots = np.array([-1 if chunk.device_info.slot is None else chunk.device_info.slot
+                                for chunk in self.tag_chunks], dtype=np.int32)
         
-        # Sort by score and return top results
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:limit]
+        # Group chunk indices by (rack, slot), each group ordered by tag name; one
+        # stable lexsort replaces a per-module Python sort
+        by_module = {}
+        if self.tag_chunks:
+            tag_names = np.array([chunk.tag_name for chunk in self.tag_chunks])
+            order = np.lexsort((tag_names, self._slots, self._racks))
+            racks, slots = self._racks[order], self._slots[order]
+            starts = np.flatnonzero(np.r_[True, (racks[1:] != racks[:-1]) | (slots[1:] != slots[:-1])])
+            for group in np.split(order, starts[1:]):
+                rack, slot = int(self._racks[group[0]]), int(self._slots[group[0]])
+                by_module[(None if rack < 0 else rack, None if slot < 0 else slot)] = group
+        
+        self._by_module = by_module
+        
+        # First chunk wins for duplicate tag names
+        by_name = {}
+        for chunk in self.tag_chunks:
+            by_name.setdefault(chunk.tag_name, chunk)
+        self._by_name = by_name
+        self._io_search_keys = [
+            (chunk.device_info.local_address.lower(), chunk.tag_name.lower())
+            for chunk in self.tag_chunks
+        ]
+        
+        # Inverted token index and filter columns for the text search fallback
+        token_index = {}
+        for idx, chunk in enumerate(self.tag_chunks):
+            for token in set(chunk.searchable_text.lower().split()):
+                token_index.setdefault(token, []).append(idx)
+        
+        self._token_index = {token: np.array(ids, dtype=np.int32) for token, ids in token_index.items()}
+        
+        self._category_codes, self._category_lookup = _categorical_codes(
+            [chunk.device_info.device_category.lower() for chunk in self.tag_chunks]
+        )
+        self._chunk_type_codes, self._chunk_type_lookup = _categorical_codes(
+            [chunk.chunk_type.value for chunk in self.tag_chunks]
+        )
+        
+        device_category_codes, device_category_lookup = _categorical_codes(
+            [chunk.device_info.device_category for chunk in self.tag_chunks]
+        )
+        self._device_category_codes, self._device_categories = device_category_codes, list(device_category_lookup)
+        function_codes, function_lookup = _categorical_codes([chunk.function for chunk in self.tag_chunks])
+        self._function_codes, self._functions = function_codes, list(function_lookup)
+        
+        self._is_safety = np.array([chunk.is_safety_tag for chunk in self.tag_chunks], dtype=bool)
+        self._is_motor = np.array([chunk.is_motor_control for chunk in self.tag_chunks], dtype=bool)
+        self._is_sensor = np.array([chunk.is_sensor for chunk in self.tag_chunks], dtype=bool)
+        self._is_vfd_module = np.array(['vfd' in chunk.device_info.module_type.lower()
+                                        for chunk in self.tag_chunks], dtype=bool)
+    
+    def _filter_mask(self, category_filter: str = None,
+                     chunk_type_filter: TagChunkType = None) -> Optional[np.ndarray]:
+        """Boolean mask over tag_chunks passing the filters, or None when unfiltered"""
+        
+        mask = None
+        if category_filter:
+            code = self._category_lookup.get(category_filter.lower(), -1)
+            mask = self._category_codes == code
+        if chunk_type_filter:
+            type_mask = self._chunk_type_codes == self._chunk_type_lookup.get(chunk_type_filter.value, -1)
+            mask = type_mask if mask is None else mask & type_mask
+        return mask
     
     def _cache_exists(self) -> bool:
         """Check if cache files exist"""
@@ -518,15 +992,28 @@ class TagVectorDatabase:
         try:
             # Save tag chunks
             with open(self.data_cache, 'wb') as f:
-                pickle.dump(self.tag_chunks, f)
+                pickle.dump(self.tag_chunks, f, protocol=pickle.HIGHEST_PROTOCOL)
             
             if FAISS_AVAILABLE and self.index is not None:
                 # Save FAISS index
                 faiss.write_index(self.index, str(self.index_cache))
                 
-                # Save embeddings
-                with open(self.embeddings_cache, 'wb') as f:
-                    pickle.dump(self.embeddings, f)
+                # Save embeddings (int8 indexes keep none)
+                if self.embeddings is not None:
+                    # Write beside the old file and swap it in so live memory maps stay valid
+                    tmp_path = self.embeddings_cache.with_name(self.embeddings_cache.name + '.tmp')
+                    with open(tmp_path, 'wb') as f:
+                        np.save(f, self.embeddings)
+                    os.replace(tmp_path, self.embeddings_cache)
+                    
+                    # Content keys let the next build reuse unchanged rows
+                    with open(self.metadata_cache, 'w') as f:
+                        json.dump({'encoder': type(self.model).__name__,
+                                   'embedding_keys': self._embedding_keys}, f)
+                else:
+                    for path in (self.embeddings_cache, self.metadata_cache):
+                        if path.exists():
+                            path.unlink()
             
             logger.info("Tag vector database cached successfully")
             
@@ -539,21 +1026,24 @@ class TagVectorDatabase:
             # Load tag chunks
             with open(self.data_cache, 'rb') as f:
                 self.tag_chunks = pickle.load(f)
+            self._build_lookup_indices()
             
             if FAISS_AVAILABLE and self.index_cache.exists():
                 # Load FAISS index
                 self.index = faiss.read_index(str(self.index_cache))
+                self._configure_index(self.index)
                 
-                # Load embeddings
+                # Memory-map embeddings; only rows touched by reranking are paged in
                 if self.embeddings_cache.exists():
-                    with open(self.embeddings_cache, 'rb') as f:
-                        self.embeddings = pickle.load(f)
+                    self.embeddings = np.load(self.embeddings_cache, mmap_mode='r')
             
             # Initialize model for new searches
             self.initialize_model()
+            self._embedding_keys = self._read_embedding_keys() if self.embeddings is not None else []
             
             logger.info(f"Loaded {len(self.tag_chunks)} tag chunks from cache")
             
         except Exception as e:
             logger.error(f"Failed to load cache: {e}")
             self.tag_chunks = []
+            self._build_lookup_indices()
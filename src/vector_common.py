@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Shared Vector Database Support
+
+Model loading, FAISS index construction, incremental embedding and the on-disk
+cache shared by the instruction and SDK vector databases. The module lives at the top of src/ so both
+packages import it the same way; loading the model through get_model() keeps a
+single copy of the weights per process instead of one per database.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Large collections use an HNSW graph index: queries walk a proximity graph of
+# HNSW_M links per node instead of scoring every vector. efSearch scales with the
+# requested result count. Smaller collections keep the exact flat index.
+HNSW_MIN_VECTORS = 5000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_MIN_EF_SEARCH = 32
+
+# Storage for flat-sized collections: 'fp32' (exact) or 'int8' (scalar quantized)
+QUANTIZATION_TYPES = {'fp32', 'int8'}
+
+# Batch size for embedding documentation texts; SentenceTransformer places the
+# model on CUDA by default when it is available
+EMBED_BATCH_SIZE = 64
+
+# Cached indexes are memory-mapped read-only; a loaded index is never modified and
+# rebuilds write a new cache generation instead of rewriting the mapped files
+INDEX_READ_FLAGS = getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+@lru_cache(maxsize=4)
+def get_model(name: str = DEFAULT_MODEL_NAME):
+    """Load a SentenceTransformer once and return the same instance on later calls"""
+    # sentence_transformers is imported lazily; it pulls in torch
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+def content_key(text: str) -> str:
+    """Stable hash identifying an embedding input"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def build_index(embeddings: np.ndarray, quantization: str) -> faiss.Index:
+    """Build an inner-product index suited to the collection size and quantization"""
+    count, dimension = embeddings.shape
+    if count >= HNSW_MIN_VECTORS:
+        index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    elif quantization == 'int8':
+        # One byte per dimension; embeddings are L2-normalized, so the range is bounded
+        index = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_8bit,
+                                           faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+    else:
+        index = faiss.IndexFlatIP(dimension)  # Inner product for cosine similarity
+    index.add(embeddings)
+    return index
+
+def search_params(index: faiss.Index, k: int) -> Optional[faiss.SearchParameters]:
+    """Per-query HNSW search parameters, or None for exact indexes"""
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=max(HNSW_MIN_EF_SEARCH, k * 4))
+    return None
+
+def encode_texts(model, texts: List[str], show_progress_bar: bool = False) -> np.ndarray:
+    """Embed texts in EMBED_BATCH_SIZE batches as float32 rows"""
+    embeddings = model.encode(texts, batch_size=EMBED_BATCH_SIZE,
+                              show_progress_bar=show_progress_bar)
+    return np.asarray(embeddings, dtype=np.float32)
+
+def embed_incrementally(model, texts: List[str], previous_embeddings: Optional[np.ndarray],
+                        previous_keys: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Embed texts, reusing previous rows for texts whose content hash is unchanged
+
+    Returns the L2-normalized embeddings (float32, rows in text order) and the
+    content key of each row. Only new or edited texts go through the model.
+    """
+    keys = [content_key(text) for text in texts]
+    known = {key: row for row, key in enumerate(previous_keys)}
+
+    missing = [i for i, key in enumerate(keys) if key not in known]
+    if len(missing) == len(texts):
+        embeddings = encode_texts(model, texts, show_progress_bar=True)
+        faiss.normalize_L2(embeddings)
+        return embeddings, keys
+
+    new_embeddings = None
+    if missing:
+        new_embeddings = encode_texts(model, [texts[i] for i in missing])
+        if new_embeddings.shape[1] != previous_embeddings.shape[1]:
+            # Rows from a model with another dimension cannot be reused
+            logger.info("Cached embeddings have a different dimension, encoding all texts")
+            embeddings = encode_texts(model, texts, show_progress_bar=True)
+            faiss.normalize_L2(embeddings)
+            return embeddings, keys
+        faiss.normalize_L2(new_embeddings)
+
+    logger.info(f"Reusing {len(texts) - len(missing)} cached embeddings, encoding {len(missing)}")
+    embeddings = np.empty((len(texts), previous_embeddings.shape[1]), dtype=np.float32)
+    reused = [i for i, key in enumerate(keys) if key in known]
+    embeddings[reused] = previous_embeddings[[known[keys[i]] for i in reused]]
+    if missing:
+        embeddings[missing] = new_embeddings
+    return embeddings, keys
+
+@dataclass
+class CachedVectors:
+    """One consistent generation of a cached vector database"""
+    records: List[Any]
+    index: Optional[faiss.Index]
+    embeddings: Optional[np.ndarray]
+    embedding_keys: List[str]
+    model_name: Optional[str]
+    quantization: Optional[str]
+
+class VectorCache:
+    """
+    On-disk cache of a vector database's records, FAISS index and embeddings
+
+    Every save writes a new generation of files and then switches to it by replacing
+    a small JSON manifest, the only file that is ever overwritten. Index and
+    embedding files may be memory-mapped (Windows refuses to replace a mapped file),
+    a failed save leaves the previous generation in place, and a load only accepts
+    files that the manifest lists and whose row counts agree.
+    """
+
+    def __init__(self, cache_dir: Path, prefix: str):
+        self.cache_dir = cache_dir
+        self.prefix = prefix
+        self.manifest_path = cache_dir / f"{prefix}_manifest.json"
+
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        """The current manifest, or None when there is no usable cache"""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def age_seconds(self) -> Optional[float]:
+        """Seconds since the current generation was written"""
+        try:
+            return time.time() - self.manifest_path.stat().st_mtime
+        except OSError:
+            return None
+
+    def save(self, records: List[Any], index: Optional[faiss.Index], embeddings: Optional[np.ndarray],
+             embedding_keys: List[str], model_name: str, quantization: str):
+        """Write a new generation and make it current"""
+        # Zero-padded so generations sort by age
+        generation = f"{time.time_ns():020x}"
+        manifest = {
+            'generation': generation,
+            'count': len(records),
+            'model': model_name,
+            'quantization': quantization,
+            'records': f"{self.prefix}_records.{generation}.pkl",
+            'index': None,
+            'embeddings': None,
+            'embedding_keys': [],
+        }
+
+        if index is not None:
+            manifest['index'] = f"{self.prefix}_index.{generation}.faiss"
+            faiss.write_index(index, str(self.cache_dir / manifest['index']))
+        if embeddings is not None:
+            manifest['embeddings'] = f"{self.prefix}_embeddings.{generation}.npy"
+            np.save(self.cache_dir / manifest['embeddings'], np.asarray(embeddings))
+            manifest['embedding_keys'] = list(embedding_keys)
+        # Records last: a generation is complete once its records file exists
+        with open(self.cache_dir / manifest['records'], 'wb') as f:
+            pickle.dump(records, f)
+
+        tmp_path = self.cache_dir / f"{self.prefix}_manifest.{generation}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+        self._remove_stale_files(manifest)
+
+    def _remove_stale_files(self, manifest: Dict[str, Any]):
+        """Delete files of older generations and of the pre-manifest cache layout"""
+        current = {manifest['records'], manifest['index'], manifest['embeddings'], self.manifest_path.name}
+        for path in self.cache_dir.glob(f"{self.prefix}_*"):
+            parts = path.name.split('.')
+            newer = len(parts) == 3 and len(parts[1]) == len(manifest['generation']) \
+                and parts[1] > manifest['generation']
+            if path.name in current or newer:
+                # Files of a save running concurrently in another process are left alone
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                # Still mapped by another process (Windows); removed by a later save
+                pass
+
+    def load(self, load_embeddings: bool = True) -> Optional[CachedVectors]:
+        """
+        Load the current generation, or None if it is missing or inconsistent
+
+        The index and embeddings are memory-mapped. Records, index and embeddings
+        must all hold the manifest's row count, so a cache left behind by an
+        interrupted or older save is rebuilt instead of searched.
+        """
+        manifest = self.read_manifest()
+        if manifest is None:
+            return None
+
+        try:
+            with open(self.cache_dir / manifest['records'], 'rb') as f:
+                records = pickle.load(f)
+            count = manifest['count']
+            if len(records) != count:
+                logger.warning(f"Cached {self.prefix} records hold {len(records)} rows, expected {count}")
+                return None
+
+            index = None
+            if manifest['index']:
+                index = faiss.read_index(str(self.cache_dir / manifest['index']), INDEX_READ_FLAGS)
+                if index.ntotal != count:
+                    logger.warning(f"Cached {self.prefix} index holds {index.ntotal} rows, expected {count}")
+                    return None
+
+            embeddings, keys = None, []
+            if load_embeddings and manifest['embeddings']:
+                embeddings = np.load(self.cache_dir / manifest['embeddings'], mmap_mode='r')
+                keys = manifest['embedding_keys']
+                if len(embeddings) != count or len(keys) != count:
+                    logger.warning(f"Cached {self.prefix} embeddings do not match {count} records")
+                    return None
+        except Exception as e:
+            logger.warning(f"Cannot load cached {self.prefix} vectors: {e}")
+            return None
+
+        return CachedVectors(records, index, embeddings, keys, manifest.get('model'),
+                             manifest.get('quantization'))
+
+    def previous_embeddings(self, model_name: str) -> Tuple[Optional[np.ndarray], List[str]]:
+        """Memory-mapped embeddings and content keys from the last build by model_name"""
+        manifest = self.read_manifest()
+        if not manifest or manifest.get('model') != model_name or not manifest.get('embeddings'):
+            return None, []
+
+        try:
+            embeddings = np.load(self.cache_dir / manifest['embeddings'], mmap_mode='r')
+            keys = manifest['embedding_keys']
+            if len(keys) == len(embeddings):
+                return embeddings, keys
+        except Exception as e:
+            logger.warning(f"Ignoring cached embeddings: {e}")
+
+        return None, []
@@ -6,14 +6,18 @@ SDK dependencies. Provides instant validation (0.001s) with no setup required.
 """
 
 import asyncio
+import functools
+import itertools
 import re
 import sys
 import os
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import time
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 
-# Common Studio 5000 instructions (hardcoded for fast validation)
-COMMON_INSTRUCTIONS = {
+# Common Studio 5000 instructions (hardcoded for fast validation, immutable)
+COMMON_INSTRUCTIONS = frozenset({
     # Basic Instructions
     'XIC', 'XIO', 'OTE', 'OTL', 'OTU', 'ONS', 'OSR', 'OSF',
     
@@ -50,18 +54,35 @@ COMMON_INSTRUCTIONS = {
     'GSV', 'SSV', 'IOT', 'MSG', 'PID', 'PIDE',
     
     # Advanced Instructions
-    'ALMA', 'ALMD', 'BAND', 'BOR', 'BXOR', 'BTDT',
+    'ALMA', 'ALMD', 'BTDT',
     'DEDT', 'DERV', 'HMIBC', 'HPF', 'INTG', 'LPF',
     'MAAT', 'MAFR', 'MAHD', 'MAHO', 'MAOC', 'MAPC',
     'MAST', 'MATC', 'MAXC', 'MDAC', 'MDCC', 'MDOC',
-    'MDSF', 'MRHD', 'MRAT', 'MRCC', 'MRCS', 'MRHD',
+    'MDSF', 'MRHD', 'MRAT', 'MRCC', 'MRCS',
     'MRST', 'MSET', 'MTLF', 'MTTP', 'MVMT', 'PATT',
     'PCMD', 'PRNP', 'RESD', 'RLLK', 'RMPD', 'RMPS',
     'SCRV', 'SEL', 'SIZE', 'SMAT', 'SMOC', 'STOS',
-    'SWPB', 'TONR', 'TOFR', 'UPDN'
-}
+    'TONR', 'TOFR', 'UPDN'
+})
 
-@dataclass
+# Pre-compiled rung patterns; Logix identifiers are ASCII, so \b and \s use the
+# cheaper ASCII-only character tests
+_INSTR_RE = re.compile(r'\b([A-Z][A-Z0-9_]*)\s*\(', re.ASCII)  # INSTRUCTION_NAME(parameters)
+_HAS_UPPER_RE = re.compile(r'[A-Z]{2,}', re.ASCII)
+
+# Routine rungs shorter than this are memoized by text (most are unchanged between
+# verifications, and trivial rungs repeat within a routine)
+RUNG_CACHE_SIZE = 4096
+RUNG_CACHE_MAX_LENGTH = 512
+
+# Checks reported in build_info; a shared tuple rather than a fresh list per result
+VALIDATION_CHECKS = ('syntax', 'instructions', 'structure')
+
+# Routines with at least this many rungs are split across worker processes
+PARALLEL_MIN_RUNGS = 4096
+
+
+@dataclass(slots=True)
 class VerificationError:
     """Represents a validation error"""
     code: str
@@ -70,7 +91,7 @@ class VerificationError:
     line_number: Optional[int] = None
     position: Optional[int] = None
 
-@dataclass  
+@dataclass(slots=True)
 class VerificationWarning:
     """Represents a validation warning"""
     code: str
@@ -78,13 +99,13 @@ class VerificationWarning:
     line_number: Optional[int] = None
     position: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult:
     """Results of ladder logic verification"""
     success: bool
     errors: List[VerificationError]
     warnings: List[VerificationWarning]
-    build_info: Dict[str, Any] 
+    build_info: Dict[str, Any] = field(default_factory=dict)
     verification_time: float = 0.0
     sdk_available: bool = False
 
@@ -99,6 +120,9 @@ class SDKVerifier:
         self.default_controller_type = "1756-L83E"
         self.default_major_revision = 36
         
+        # Per-instance memo of _rung_issues for verify_routine
+        self._cached_rung_issues = functools.lru_cache(maxsize=RUNG_CACHE_SIZE)(self._rung_issues)
+        
     async def verify_ladder_logic(self, ladder_logic: str, context: Optional[Dict[str, Any]] = None) -> VerificationResult:
         """
         Verify ladder logic using fast validation (reliable and instant)
@@ -112,14 +136,18 @@ class SDKVerifier:
         Returns:
             VerificationResult with success status and detailed error information
         """
-        start_time = asyncio.get_event_loop().time()
+        return self._verify_ladder_logic_sync(ladder_logic, context)
+    
+    def _verify_ladder_logic_sync(self, ladder_logic: str, context: Optional[Dict[str, Any]] = None) -> VerificationResult:
+        """Synchronous core of verify_ladder_logic (validation never awaits anything)"""
+        start_time = time.perf_counter()
         context = context or {}
         
         # Use fast validation (reliable, fast, always works)
-        result = await self._fast_verify_ladder_logic(ladder_logic, context)
+        result = self._fast_verify_ladder_logic(ladder_logic, context)
         
         # Set timing
-        result.verification_time = asyncio.get_event_loop().time() - start_time
+        result.verification_time = time.perf_counter() - start_time
         return result
     
     async def verify_routine(self, routine_name: str, rungs: List[str], context: Optional[Dict[str, Any]] = None) -> VerificationResult:
@@ -137,17 +165,27 @@ class SDKVerifier:
         all_errors = []
         all_warnings = []
         
-        for i, rung in enumerate(rungs):
-            rung_result = await self.verify_ladder_logic(rung, context)
-            
-            # Add rung number to errors and warnings
-            for error in rung_result.errors:
-                error.line_number = i
-                all_errors.append(error)
-            
-            for warning in rung_result.warnings:
-                warning.line_number = i  
-                all_warnings.append(warning)
+        workers = os.cpu_count() or 1
+        if len(rungs) >= PARALLEL_MIN_RUNGS and workers > 1:
+            # Rungs are independent; validate contiguous slices in worker processes
+            loop = asyncio.get_running_loop()
+            pool = _get_process_pool()
+            slice_size = -(-len(rungs) // workers)
+            slices = await asyncio.gather(*(
+                loop.run_in_executor(pool, _rung_issues_batch, rungs[start:start + slice_size])
+                for start in range(0, len(rungs), slice_size)
+            ))
+            rung_issues = itertools.chain.from_iterable(slices)
+        else:
+            # No per-rung VerificationResult is built; short rungs come from the memo
+            rung_issues = (self._cached_rung_issues(rung) if len(rung) < RUNG_CACHE_MAX_LENGTH
+                           else self._rung_issues(rung)
+                           for rung in rungs)
+        
+        for i, (errors, warnings) in enumerate(rung_issues):
+            # Add rung number to (copies of) errors and warnings
+            all_errors.extend(replace(error, line_number=i) for error in errors)
+            all_warnings.extend(replace(warning, line_number=i) for warning in warnings)
         
         return VerificationResult(
             success=len(all_errors) == 0,
@@ -162,7 +200,7 @@ class SDKVerifier:
             }
         )
 
-    async def _fast_verify_ladder_logic(self, ladder_logic: str, context: Dict[str, Any]) -> VerificationResult:
+    def _fast_verify_ladder_logic(self, ladder_logic: str, context: Dict[str, Any]) -> VerificationResult:
         """
         Fast validation using syntax checks and instruction validation
         
@@ -182,11 +220,8 @@ class SDKVerifier:
         errors = []
         warnings = []
         
-        if not ladder_logic or not ladder_logic.strip():
-            errors.append(VerificationError(
-                code="EMPTY_LOGIC",
-                message="Ladder logic is empty"
-            ))
+        rung_count = self._collect_issues(ladder_logic, errors, warnings)
+        if rung_count is None:
             return VerificationResult(
                 success=False, 
                 errors=errors,
@@ -194,44 +229,67 @@ class SDKVerifier:
                 build_info={'verification_method': 'fast_validation'}
             )
         
-        # Split into rungs for individual validation
-        rungs = [rung.strip() for rung in ladder_logic.split(';') if rung.strip()]
-        
-        for rung_idx, rung in enumerate(rungs):
-            # 1. Syntax validation
-            syntax_errors = self._validate_ladder_syntax(rung, rung_idx)
-            errors.extend(syntax_errors)
-            
-            # 2. Instruction validation
-            instruction_errors = self._validate_instructions_fast(rung, rung_idx)
-            errors.extend(instruction_errors)
-            
-            # 3. Basic structure validation
-            structure_warnings = self._validate_basic_structure(rung, rung_idx)
-            warnings.extend(structure_warnings)
-        
-        # 4. Overall logic validation
-        overall_errors = self._validate_overall_logic(ladder_logic)
-        errors.extend(overall_errors)
-        
         return VerificationResult(
             success=len(errors) == 0,
             errors=errors,
             warnings=warnings,
             build_info={
                 'verification_method': 'fast_validation',
-                'rung_count': len(rungs),
-                'validation_checks': ['syntax', 'instructions', 'structure'],
+                'rung_count': rung_count,
+                'validation_checks': VALIDATION_CHECKS,
                 'total_errors': len(errors),
                 'total_warnings': len(warnings)
             }
         )
 
-    def _validate_ladder_syntax(self, rung: str, rung_number: int) -> List[VerificationError]:
-        """Validate basic ladder logic syntax"""
+    def _rung_issues(self, rung: str) -> Tuple[Tuple[VerificationError, ...], Tuple[VerificationWarning, ...]]:
+        """Errors and warnings for one routine rung (shared by the memo; copy before changing)"""
         errors = []
+        warnings = []
+        self._collect_issues(rung, errors, warnings)
+        return tuple(errors), tuple(warnings)
+
+    def _collect_issues(self, ladder_logic: str, errors: List[VerificationError],
+                        warnings: List[VerificationWarning]) -> Optional[int]:
+        """
+        Append the errors and warnings for a piece of ladder logic
         
-        # Check balanced parentheses
+        Returns:
+            Number of rungs validated, or None if the logic is empty
+        """
+        if not ladder_logic or not ladder_logic.strip():
+            errors.append(VerificationError(
+                code="EMPTY_LOGIC",
+                message="Ladder logic is empty"
+            ))
+            return None
+        
+        # Split into rungs for individual validation; each piece is stripped once
+        # and validated as it is reached, without collecting a list of rungs
+        rung_count = 0
+        for rung in ladder_logic.split(';'):
+            rung = rung.strip()
+            if not rung:
+                continue
+            # 1-3. Syntax, instruction and basic structure validation
+            self._validate_rung(rung, rung_count, errors, warnings)
+            rung_count += 1
+        
+        # 4. Overall logic validation
+        errors.extend(self._validate_overall_logic(ladder_logic))
+        
+        return rung_count
+
+    def _validate_rung(self, rung: str, rung_number: int,
+                       errors: List[VerificationError], warnings: List[VerificationWarning]):
+        """
+        Validate one rung's syntax, instructions and structure in a single pass
+        
+        Each property of the rung (parenthesis counts, instruction names, output
+        instructions) is computed once and shared by all checks. Errors and warnings
+        are appended in the order syntax, instructions, structure.
+        """
+        # Syntax: balanced parentheses
         open_parens = rung.count('(')
         close_parens = rung.count(')')
         
@@ -242,48 +300,36 @@ class SDKVerifier:
                 line_number=rung_number
             ))
         
-        # Check for empty instructions (consecutive parentheses)
-        if '()' in rung:
+        # Syntax: empty instructions (consecutive parentheses)
+        if close_parens and '()' in rung:
             errors.append(VerificationError(
                 code="EMPTY_INSTRUCTION",
                 message=f"Empty instruction parameters in rung {rung_number}",
                 line_number=rung_number
             ))
         
-        # Check for proper instruction format
-        if rung and not re.search(r'[A-Z]{2,}', rung):
+        instructions_found = _INSTR_RE.findall(rung) if open_parens else []
+        unknown = [instruction for instruction in instructions_found
+                   if instruction not in COMMON_INSTRUCTIONS]
+        
+        # Syntax: proper instruction format (any known instruction name already qualifies)
+        if (rung and len(unknown) == len(instructions_found)
+                and not _HAS_UPPER_RE.search(rung)):
             errors.append(VerificationError(
                 code="NO_INSTRUCTIONS",
                 message=f"No valid instructions found in rung {rung_number}",
                 line_number=rung_number
             ))
         
-        return errors
-
-    def _validate_instructions_fast(self, rung: str, rung_number: int) -> List[VerificationError]:
-        """Fast instruction validation against known instruction set"""
-        errors = []
-        
-        # Extract all instruction names using regex
-        # Pattern matches: INSTRUCTION_NAME(parameters)
-        instruction_pattern = r'\b([A-Z][A-Z0-9_]*)\s*\('
-        instructions_found = re.findall(instruction_pattern, rung)
-        
-        for instruction in instructions_found:
-            if instruction not in COMMON_INSTRUCTIONS:
-                errors.append(VerificationError(
-                    code="UNKNOWN_INSTRUCTION", 
-                    message=f"Unknown or invalid instruction: {instruction}",
-                    line_number=rung_number
-                ))
-        
-        return errors
-
-    def _validate_basic_structure(self, rung: str, rung_number: int) -> List[VerificationWarning]:
-        """Validate basic ladder logic structure and patterns"""
-        warnings = []
+        # Instructions: against known instruction set
+        for instruction in unknown:
+            errors.append(VerificationError(
+                code="UNKNOWN_INSTRUCTION", 
+                message=f"Unknown or invalid instruction: {instruction}",
+                line_number=rung_number
+            ))
         
-        # Check for common patterns
+        # Structure: inputs without outputs
         if 'XIC(' in rung and 'OTE(' not in rung and 'OTL(' not in rung and 'OTU(' not in rung:
             warnings.append(VerificationWarning(
                 code="INPUT_ONLY",
@@ -291,22 +337,21 @@ class SDKVerifier:
                 line_number=rung_number
             ))
         
-        # Check for very long rungs (might be hard to read)
+        # Structure: very long rungs (might be hard to read)
         if len(rung) > 200:
             warnings.append(VerificationWarning(
                 code="LONG_RUNG",
                 message=f"Rung {rung_number} is very long ({len(rung)} characters) - consider breaking into multiple rungs",
                 line_number=rung_number
             ))
-        
-        return warnings
 
     def _validate_overall_logic(self, ladder_logic: str) -> List[VerificationError]:
         """Validate overall ladder logic structure"""
         errors = []
         
-        # Check for proper rung termination
-        if ladder_logic.strip() and not ladder_logic.strip().endswith(';'):
+        # Check for proper rung termination; only trailing whitespace matters here
+        stripped = ladder_logic.rstrip()
+        if stripped and not stripped.endswith(';'):
             errors.append(VerificationError(
                 code="MISSING_TERMINATOR",
                 message="Ladder logic should end with semicolon (;)"
@@ -314,5 +359,30 @@ class SDKVerifier:
         
         return errors
 
-# Global instance for easy access
-sdk_verifier = SDKVerifier()
+_process_pool: Optional[ProcessPoolExecutor] = None
+_worker_verifier: Optional[SDKVerifier] = None
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Shared worker pool for large routines, created on first use"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor()
+    return _process_pool
+
+def _rung_issues_batch(rungs: List[str]) -> List[Tuple[Tuple[VerificationError, ...], Tuple[VerificationWarning, ...]]]:
+    """Worker entry point: (errors, warnings) for each rung of a routine slice"""
+    global _worker_verifier
+    if _worker_verifier is None:
+        _worker_verifier = SDKVerifier()
+    return [_worker_verifier._rung_issues(rung) for rung in rungs]
+
+_sdk_verifier: Optional[SDKVerifier] = None
+
+def __getattr__(name: str) -> Any:
+    """Create the global ``sdk_verifier`` instance on first access"""
+    global _sdk_verifier
+    if name == 'sdk_verifier':
+        if _sdk_verifier is None:
+            _sdk_verifier = SDKVerifier()
+        return _sdk_verifier
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")